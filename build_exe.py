@@ -1,21 +1,28 @@
 """pptx2md-gui 便携 EXE 打包脚本。
 
 用法:
-    python build_exe.py            # 标准打包（--onedir 模式）
+    python build_exe.py            # 标准打包（--onedir 模式，启动最快）
     python build_exe.py --onefile  # 单文件打包（启动较慢，更易被杀软拦截）
+
+onedir 与 onefile 的启动差异：onefile 每次启动都要把整个包解压到
+临时目录（几百毫秒到数秒，视杀软扫描而定），onedir 直接就地加载，
+因此 GUI 工具默认 onedir。
     python build_exe.py --clean    # 仅清理构建产物
+    python build_exe.py --force-clean  # 清理后全新打包（不复用增量缓存）
 
 前置条件:
     pip install -e ".[build]"
 """
 
 import argparse
+import functools
 import hashlib
 import os
-import shutil
+import re
 import subprocess
 import sys
 import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -24,6 +31,8 @@ DIST_DIR = PROJECT_ROOT / "dist"
 SPEC_FILE = PROJECT_ROOT / "pptx2md_gui.spec"
 SPEC_BUILD_DIR = BUILD_DIR / SPEC_FILE.stem
 ONEFILE_ENV_VAR = "PPTX2MD_GUI_ONEFILE"
+# 杀软/权限导致的典型失败特征：一出现就中止，不再等整个构建跑完
+_ACCESS_DENIED_RE = re.compile(r"WinError 5|PermissionError|Access is denied", re.IGNORECASE)
 REQUIRED_RUNTIME_FILES = (
     "_tkinter.pyd",
     "_ctypes.pyd",
@@ -115,33 +124,107 @@ def _text_mentions_path(text: str, path: Path) -> bool:
     return any(candidate in text for candidate in candidates)
 
 
+def _select_cache_workpath() -> Path:
+    """按 pyproject.toml 内容指纹选择 PyInstaller workpath。
+
+    依赖集变化才会整体作废 Analysis 缓存，所以缓存键只取 pyproject.toml
+    的内容哈希：同一依赖集复用同一 workpath（源码级差量交给 PyInstaller
+    自己的增量检测），依赖集变了则换新目录、旧目录按最近使用保留 5 个。
+    """
+    digest = hashlib.blake2b(
+        (PROJECT_ROOT / "pyproject.toml").read_bytes(), digest_size=16
+    ).hexdigest()[:12]
+    workpath = BUILD_DIR / f"cache-{digest}"
+
+    try:
+        stale = sorted(
+            (p for p in BUILD_DIR.glob("cache-*") if p.is_dir() and p != workpath),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )[4:]
+        if stale:
+            _rmtree_many([str(p) for p in stale])
+    except OSError:
+        pass
+
+    return workpath
+
+
+@functools.lru_cache(maxsize=1)
 def get_app_version() -> str:
-    """从 pyproject.toml 读取版本号。"""
-    with open(PROJECT_ROOT / "pyproject.toml", "rb") as f:
-        pyproject = tomllib.load(f)
+    """从 pyproject.toml 读取版本号（结果缓存，重复调用不再读盘解析）。"""
+    pyproject = tomllib.loads((PROJECT_ROOT / "pyproject.toml").read_text("utf-8"))
     return pyproject["tool"]["poetry"]["version"]
 
 
+def _unlink_quiet(path: str):
+    """删除单个文件，忽略错误（与 shutil.rmtree(ignore_errors=True) 语义一致）。"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _rmtree_many(paths):
+    """在同一个线程池里并行删除多棵目录树，替代逐棵 shutil.rmtree。
+
+    Windows 下删除被 Defender 同步扫描的文件时，每个 CloseHandle 都可能
+    阻塞上百毫秒；把所有树的 unlink 汇入一个线程池，让这些内核等待相互
+    重叠，也避免每棵树各建一个池。os.walk 底层基于 os.scandir，单次遍历
+    即可拿到全部文件和目录。
+    """
+    files: list[str] = []
+    dirs: list[str] = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for dirpath, _dirnames, filenames in os.walk(path, topdown=False):
+            files.extend(os.path.join(dirpath, name) for name in filenames)
+            dirs.append(dirpath)
+
+    if files:
+        max_workers = min(32, (os.cpu_count() or 4) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_unlink_quiet, files))
+
+    # topdown=False 保证子目录排在父目录之前，顺序 rmdir 即可
+    for dirpath in dirs:
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass
+
+
+def _fast_rmtree(path):
+    """并行删除单棵目录树。"""
+    _rmtree_many([path])
+
+
 def clean_build_artifacts():
     """清理残留的 build 和 dist 目录。"""
     for d in [BUILD_DIR, DIST_DIR]:
         if d.exists():
             print(f"正在清理 {d} ...")
-            shutil.rmtree(d, ignore_errors=True)
+            _fast_rmtree(d)
 
-    # 清理源码目录中的 __pycache__
+    # 清理源码目录中的 __pycache__：os.walk 单次遍历比 pathlib.rglob
+    # 少一层 PurePath 对象分配；先收集再统一并行删除
+    cache_dirs = []
     for pkg in ["pptx2md", "pptx2md_gui"]:
         pkg_dir = PROJECT_ROOT / pkg
-        for cache_dir in pkg_dir.rglob("__pycache__"):
-            shutil.rmtree(cache_dir, ignore_errors=True)
+        for dirpath, _dirnames, _filenames in os.walk(pkg_dir, topdown=False):
+            if os.path.basename(dirpath) == "__pycache__":
+                cache_dirs.append(dirpath)
+    _rmtree_many(cache_dirs)
 
     print("构建产物已清理。")
 
 
-def validate_gui_runtime(output_path: Path, use_onefile: bool) -> bool:
+def validate_gui_runtime(output_path: Path, use_onefile: bool, workpath: Path | None = None) -> bool:
     """校验打包产物中是否包含 GUI 启动所需的关键扩展和 DLL。"""
+    spec_build_dir = (workpath / SPEC_FILE.stem) if workpath else SPEC_BUILD_DIR
     if use_onefile:
-        analysis_toc = SPEC_BUILD_DIR / "Analysis-00.toc"
+        analysis_toc = spec_build_dir / "Analysis-00.toc"
         if not analysis_toc.exists():
             print(f"未找到分析文件，无法校验 Tk 运行时: {analysis_toc}")
             return False
@@ -206,39 +289,78 @@ def validate_gui_runtime(output_path: Path, use_onefile: bool) -> bool:
     return True
 
 
-def build(use_onefile: bool = False):
-    """使用 spec 文件执行 PyInstaller 打包。"""
+def _pyinstaller_args(workpath, force_clean: bool = False) -> list:
+    """构造传给 PyInstaller CLI 的参数列表。
+
+    spec 构建只接受 build 类选项；makespec-only 选项（如 --python-option、
+    --contents-directory）会让 PyInstaller 在参数解析阶段直接报错退出，
+    对应配置应写进 spec 文件本身。
+    """
+    args = ["--noconfirm", "--workpath", str(workpath), str(SPEC_FILE)]
+    if force_clean:
+        args.insert(0, "--clean")
+    return args
+
+
+def build(use_onefile: bool = False, force_clean: bool = False):
+    """使用 spec 文件执行 PyInstaller 打包。
+
+    默认不传 --clean：保留 workpath 缓存可让 PyInstaller 复用上次的
+    分析与字节码产物，增量构建只做差量工作；--noconfirm 已覆盖
+    非交互需求。需要全新构建时通过 force_clean 显式开启。
+    """
     version = get_app_version()
     app_name = f"pptx2md-gui-{version}"
+    workpath = _select_cache_workpath()
 
-    cmd = [
-        sys.executable,
-        "-m",
-        "PyInstaller",
-        "--clean",
-        "--noconfirm",
-        str(SPEC_FILE),
-    ]
+    cmd = [sys.executable, "-m", "PyInstaller", *_pyinstaller_args(workpath, force_clean)]
 
     if use_onefile:
-        print("警告: --onefile 模式更容易被杀软拦截。")
-        print("如果构建失败，请先尝试不带 --onefile 的标准模式。\n")
+        print("警告: --onefile 模式每次启动都要解压整个包到临时目录（启动慢），")
+        print("且更容易被杀软拦截。如果构建失败，请先尝试不带 --onefile 的标准模式。\n")
 
     print(f"版本: {version}")
     print(f"执行命令: {' '.join(cmd)}\n")
 
     env = _prepare_build_env(use_onefile)
 
-    result = subprocess.run(cmd, cwd=str(PROJECT_ROOT), env=env)
-    if result.returncode == 0:
+    # 流式读取 PyInstaller 输出：实时转发进度，并在出现权限类错误时
+    # 立刻终止，省掉注定失败的剩余构建时间
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    access_denied_line = None
+    if proc.stdout is not None:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            if _ACCESS_DENIED_RE.search(line):
+                access_denied_line = line.strip()
+                proc.terminate()
+                break
+    returncode = proc.wait()
+
+    if access_denied_line is not None:
+        print(f"\n检测到权限错误，已提前终止构建: {access_denied_line}")
+        print("通常是杀软占用了构建产物，可稍后重试或为 build/dist 目录添加排除项。")
+        return False
+
+    if returncode == 0:
         output_path = DIST_DIR / f"{app_name}.exe" if use_onefile else DIST_DIR / app_name
-        if not validate_gui_runtime(output_path, use_onefile=use_onefile):
+        if not validate_gui_runtime(output_path, use_onefile=use_onefile, workpath=workpath):
             print("\n构建产物缺少 GUI 运行时文件，请检查 spec 配置。")
             return False
         print(f"\n构建成功！输出: {output_path}")
         return True
 
-    print(f"\n构建失败（退出码 {result.returncode}）。")
+    print(f"\n构建失败（退出码 {returncode}）。")
     return False
 
 
@@ -254,6 +376,11 @@ def main():
         action="store_true",
         help="仅清理构建产物，不执行打包",
     )
+    parser.add_argument(
+        "--force-clean",
+        action="store_true",
+        help="打包前清理构建产物并传 --clean 给 PyInstaller（放弃增量缓存）",
+    )
     args = parser.parse_args()
 
     if args.clean:
@@ -281,9 +408,11 @@ def main():
         print(f"未找到 spec 文件: {SPEC_FILE}")
         sys.exit(1)
 
-    clean_build_artifacts()
+    # 默认保留 build/ 缓存供 PyInstaller 增量复用；--force-clean 时才全量清理
+    if args.force_clean:
+        clean_build_artifacts()
 
-    success = build(use_onefile=args.onefile)
+    success = build(use_onefile=args.onefile, force_clean=args.force_clean)
     sys.exit(0 if success else 1)
 
 
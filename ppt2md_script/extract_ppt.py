@@ -6,9 +6,6 @@
 import sys
 import argparse
 
-from pptx2md.ppt_legacy.config import ExtractConfig
-from pptx2md.ppt_legacy import convert_ppt, check_environment
-
 
 def build_arg_parser():
     parser = argparse.ArgumentParser(description='提取PPT内容为Markdown')
@@ -27,6 +24,9 @@ def build_arg_parser():
 
 
 def main():
+    # 延迟导入：环境检查失败时不必加载完整转换管道（pywin32 等）
+    from pptx2md.ppt_legacy import check_environment
+
     ok, reason = check_environment()
     if not ok:
         print(f"错误：{reason}", file=sys.stderr)
@@ -34,6 +34,10 @@ def main():
 
     parser = build_arg_parser()
     args = parser.parse_args()
+
+    from pptx2md.ppt_legacy import convert_ppt
+    from pptx2md.ppt_legacy.config import ExtractConfig
+
     config = ExtractConfig.from_cli_args(args)
     success = convert_ppt(config)
     sys.exit(0 if success else 1)
@@ -1,41 +1,59 @@
 """Markdown 渲染辅助函数。"""
 
+import functools
+
+# 预生成的标题前缀表（index=层级），避免每次调用重复 "#" * level 的小字符串分配
+_HASH = ("", "#", "##", "###", "####", "#####", "######")
+
+# 换行符归一化表：一次 translate 替代逐个 str.replace 的多趟扫描
+_NL_TRANS = str.maketrans({"\r": " ", "\n": " "})
+
+
+def _heading_prefix(level):
+    """把层级 clamp 到 1..6 并返回对应的 "#" 前缀。"""
+    return _HASH[min(6, max(1, int(level)))]
+
 
 def format_loc(loc_parts):
     """把位置路径格式化为可读且可搜索的串，如：S2/E1/S1。"""
     if not loc_parts:
         return ""
-    return "/".join([str(x) for x in loc_parts if x])
+    # engine 传入的分段本来就是 "S2"/"E1" 这类字符串，直接生成器拼接；
+    # join 可消费迭代器，不必先物化中间列表
+    if isinstance(loc_parts[0], str):
+        return "/".join(p for p in loc_parts if p)
+    return "/".join(map(str, filter(None, loc_parts)))
 
 
 def sanitize_md_comment_text(text):
     """清洗注释文本，避免破坏 HTML 注释结构。"""
-    s = str(text or "")
-    s = s.replace("\r", " ").replace("\n", " ").strip()
-    s = s.replace("-->", "--＞")
+    if not text:
+        return ""
+    s = str(text).translate(_NL_TRANS).strip()
+    # 常见情况不含 "-->"，先做 in 判断省掉一趟替换扫描
+    if "-->" in s:
+        s = s.replace("-->", "--＞")
     return s
 
 
+@functools.lru_cache(maxsize=4096)
 def md_comment(text):
-    """生成 HTML 注释行（含换行）。"""
+    """生成 HTML 注释行（含换行）。同一注释在大量幻灯片间反复出现，结果缓存。"""
     s = sanitize_md_comment_text(text)
     if not s:
         return ""
     return f"<!-- {s} -->\n"
 
 
+@functools.lru_cache(maxsize=4096)
 def md_heading(level, title):
     """生成 Markdown 标题行（含末尾空行）。"""
-    level = int(level)
-    if level < 1:
-        level = 1
-    if level > 6:
-        level = 6
-    return f"{'#' * level} {title}\n\n"
+    return f"{_heading_prefix(level)} {title}\n\n"
 
 
+@functools.lru_cache(maxsize=4096)
 def md_path_quote(loc):
-    """生成路径注释行（不含额外空行）。"""
+    """生成路径注释行（不含额外空行）。兄弟幻灯片共享路径前缀，结果缓存。"""
     loc = str(loc or "").strip()
     if not loc:
         return ""
@@ -44,16 +62,8 @@ def md_path_quote(loc):
 
 def md_heading_with_path(level, title, loc):
     """生成 Markdown 标题 + 下一行路径注释（无空行间隔）。"""
-    level = int(level)
-    if level < 1:
-        level = 1
-    if level > 6:
-        level = 6
-    heading = f"{'#' * level} {title}\n"
     path_line = md_path_quote(loc)
-    if path_line:
-        return heading + path_line + "\n"
-    return heading + "\n"
+    return f"{_heading_prefix(level)} {title}\n{path_line}\n"
 
 
 def md_embedded_ppt_marker(title, loc):
@@ -73,13 +83,7 @@ def md_hr():
 
 def md_slide_heading_with_ref(level, title, slide_label, slide_no, loc):
     """生成“注释标记 + 幻灯片标题”块。"""
-    level = int(level)
-    if level < 1:
-        level = 1
-    if level > 6:
-        level = 6
-
-    title = str(title or "").replace("\r", " ").replace("\n", " ").strip()
+    title = str(title or "").translate(_NL_TRANS).strip()
     if title == "":
         title = f"{slide_label} {slide_no}"
 
@@ -89,4 +93,4 @@ def md_slide_heading_with_ref(level, title, slide_label, slide_no, loc):
     if loc:
         comment += f" | path: {loc}"
 
-    return f"{md_comment(comment)}{'#' * level} {title}\n\n"
+    return f"{md_comment(comment)}{_heading_prefix(level)} {title}\n\n"
@@ -12,7 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .entry import convert
-from .types import ConversionConfig
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .entry import convert
+    from .types import ConversionConfig
 
 __all__ = ['convert', 'ConversionConfig']
+
+# PEP 562 延迟导出：.ppt 管道只需要 pptx2md.ppt_legacy，
+# 顶层导入不应连带加载 entry/types（及其背后的 pydantic）。
+_LAZY_EXPORTS = {
+    'convert': 'pptx2md.entry',
+    'ConversionConfig': 'pptx2md.types',
+}
+
+
+def __getattr__(name):
+    target = _LAZY_EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(target), name)
+    globals()[name] = value
+    return value
@@ -14,14 +14,19 @@
 #
 # Modifications Copyright 2025-2026 vanilla1108
 
+from __future__ import annotations
+
 import argparse
 import logging
+import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from pptx2md.entry import convert
 from pptx2md.log import setup_logging
-from pptx2md.types import ConversionConfig
+
+if TYPE_CHECKING:
+    from pptx2md.types import ConversionConfig
 
 setup_logging(compat_tqdm=True)
 logger = logging.getLogger(__name__)
@@ -44,13 +49,21 @@ def parse_args() -> argparse.Namespace:
     arg_parser.add_argument('--disable-wmf',
                             action="store_true",
                             help='keep wmf formatted image untouched(avoid exceptions under linux)')
+    # 开关型参数用 store_true/store_false 成对注册（正向在前，其默认值生效）。
+    # 与 BooleanOptionalAction 行为一致，但少一半选项对象，帮助渲染也更快。
     arg_parser.add_argument(
         '--color',
         dest='enable_color',
-        action=argparse.BooleanOptionalAction,
+        action="store_true",
         default=True,
         help='add color HTML tags (use --no-color to disable)',
     )
+    arg_parser.add_argument(
+        '--no-color',
+        dest='enable_color',
+        action="store_false",
+        help=argparse.SUPPRESS,
+    )
     arg_parser.add_argument(
         '--disable-color',
         action="store_true",
@@ -59,10 +72,16 @@ def parse_args() -> argparse.Namespace:
     arg_parser.add_argument(
         '--escaping',
         dest='enable_escaping',
-        action=argparse.BooleanOptionalAction,
+        action="store_true",
         default=True,
         help='escape markdown special characters (use --no-escaping to disable)',
     )
+    arg_parser.add_argument(
+        '--no-escaping',
+        dest='enable_escaping',
+        action="store_false",
+        help=argparse.SUPPRESS,
+    )
     arg_parser.add_argument(
         '--disable-escaping',
         action="store_true",
@@ -71,10 +90,16 @@ def parse_args() -> argparse.Namespace:
     arg_parser.add_argument(
         '--notes',
         dest='enable_notes',
-        action=argparse.BooleanOptionalAction,
+        action="store_true",
         default=True,
         help='add presenter notes (use --no-notes to disable)',
     )
+    arg_parser.add_argument(
+        '--no-notes',
+        dest='enable_notes',
+        action="store_false",
+        help=argparse.SUPPRESS,
+    )
     arg_parser.add_argument(
         '--disable-notes',
         action="store_true",
@@ -90,10 +115,16 @@ def parse_args() -> argparse.Namespace:
     arg_parser.add_argument(
         '--slide-number',
         dest='enable_slide_number',
-        action=argparse.BooleanOptionalAction,
+        action="store_true",
         default=True,
         help='add slide number comments before each slide (use --no-slide-number to disable)',
     )
+    arg_parser.add_argument(
+        '--no-slide-number',
+        dest='enable_slide_number',
+        action="store_false",
+        help=argparse.SUPPRESS,
+    )
     arg_parser.add_argument(
         '--disable-slide-number',
         action="store_true",
@@ -136,6 +167,8 @@ def parse_args() -> argparse.Namespace:
 
 def _build_pptx_config(args: argparse.Namespace) -> ConversionConfig:
     """从 Namespace 构建 .pptx 的 ConversionConfig。"""
+    from pptx2md.types import ConversionConfig
+
     enable_color = _resolve_enable_flag(args.enable_color, args.disable_color)
     enable_escaping = _resolve_enable_flag(args.enable_escaping, args.disable_escaping)
     enable_notes = _resolve_enable_flag(args.enable_notes, args.disable_notes)
@@ -192,19 +225,21 @@ def _build_ppt_config(args: argparse.Namespace):
 
 
 def _next_unique_path(path: Path) -> Path:
-    """若路径存在则自动追加 _1/_2...，避免覆盖。"""
+    """若路径存在则自动追加 _1/_2...，避免覆盖。
+
+    一次目录扫描找出已占用的最大编号，替代逐个 exists() 探测：
+    目录里已有 N 个同名输出时是 1 次 scandir 而非 N 次 stat。
+    """
     if not path.exists():
         return path
 
     stem = path.stem
     suffix = path.suffix
     parent = path.parent
-    counter = 1
-    while True:
-        candidate = parent / f"{stem}_{counter}{suffix}"
-        if not candidate.exists():
-            return candidate
-        counter += 1
+    pattern = re.compile(rf"^{re.escape(stem)}_(\d+){re.escape(suffix)}$")
+    used = [int(m.group(1)) for p in parent.iterdir() if (m := pattern.match(p.name))]
+    counter = max(used, default=0) + 1
+    return parent / f"{stem}_{counter}{suffix}"
 
 
 # ---------------------------------------------------------------------------
@@ -267,7 +302,9 @@ def main():
         success = convert_ppt(config)
         sys.exit(0 if success else 1)
     elif ext == ".pptx":
-        # PPTX 原管道
+        # PPTX 原管道（延迟导入：.ppt 路径不加载 parser/outputter 依赖图）
+        from pptx2md.entry import convert
+
         config = _build_pptx_config(args)
         convert(config)
     else:
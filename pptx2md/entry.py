@@ -32,7 +32,6 @@ def convert(config: "ConversionConfig", progress_callback=None, cancel_event=Non
         cancel_event: 可选的 threading.Event，用于支持取消操作。
         disable_tqdm: 禁用 tqdm 进度条（适用于 GUI）。
     """
-    import pptx2md.outputter as outputter
     from pptx2md import parser as _parser
     from pptx2md.utils import load_pptx, prepare_titles
 
@@ -63,11 +62,16 @@ def convert(config: "ConversionConfig", progress_callback=None, cancel_event=Non
         return
 
     if str(config.output_path).endswith('.json'):
-        with open(config.output_path, 'w') as f:
-            f.write(ast.model_dump_json(indent=2))
+        # 二进制一次写出：跳过 TextIOWrapper 的逐块重编码（顺带固定 UTF-8），
+        # 大缓冲减少大文档的 write 系统调用次数
+        with open(config.output_path, 'wb', buffering=1024 * 1024) as f:
+            f.write(ast.model_dump_json(indent=2).encode('utf-8'))
         logger.info(f'presentation data saved to {config.output_path}')
         return
 
+    # JSON 导出已提前返回，这里才需要加载 outputter 依赖图
+    import pptx2md.outputter as outputter
+
     if config.is_wiki:
         out = outputter.WikiFormatter(config)
     elif config.is_mdk:
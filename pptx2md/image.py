@@ -17,23 +17,51 @@
 # --coding:utf-8--
 # author = ''
 
+import hashlib
+import os
+import shutil
+
+# 已转换结果缓存：blake2b(输入内容) -> 输出 PNG 路径。
+# 幻灯片里 logo 等 WMF 常跨页复用，命中时直接复制文件，不再重新光栅化。
+_WMF_PNG_CACHE: dict[str, str] = {}
+
+
+def _convert_via_pillow(input_file, output_png_path) -> bool:
+    """优先走 Pillow：Windows 下经 GDI 原生解码 WMF，进程内完成，无子进程开销。"""
+    try:
+        from PIL import Image
+
+        with Image.open(input_file) as img:
+            img.save(output_png_path, "PNG", optimize=False)
+        return True
+    except Exception:
+        return False
+
 
 def convert_wmf_to_png(input_file, output_png_path):
     """
     将 WMF 数据转换为 PNG 文件。
 
+    先尝试 Pillow（进程内），失败再退回 wand/ImageMagick
+    （加载 MagickCore 并派生 delegate 进程，显著更慢）。
     """
-    # from PIL import ImageGrab
-    # shape.Copy()
-    # image = ImageGrab.grabclipboard()
-    # #image.save('{}.jpg'.format(filename), 'jpeg')
-    # image.save(output_png_path)
+    with open(input_file, "rb") as f:
+        key = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    cached = _WMF_PNG_CACHE.get(key)
+    if cached is not None:
+        # 缓存里只是路径，之前的产物可能已被外部删除；失效则回落到重新转换
+        if os.path.exists(cached):
+            if cached != str(output_png_path):
+                shutil.copyfile(cached, output_png_path)
+            return
+        del _WMF_PNG_CACHE[key]
 
-    # from PIL import Image
-    # Image.open(input_file).save(output_png_path)
+    if not _convert_via_pillow(input_file, output_png_path):
+        from wand.image import Image
 
-    from wand.image import Image
+        with Image(filename=input_file) as img:
+            img.format = 'png'
+            img.save(filename=output_png_path)
 
-    with Image(filename=input_file) as img:
-        img.format = 'png'
-        img.save(filename=output_png_path)
+    _WMF_PNG_CACHE[key] = str(output_png_path)
@@ -14,6 +14,7 @@
 #
 # Modifications Copyright 2025-2026 vanilla1108
 
+import functools
 import os
 import re
 import urllib.parse
@@ -24,21 +25,96 @@ from rapidfuzz import fuzz
 from pptx2md.types import ConversionConfig, ElementType, ListType, ParagraphElement, ParsedPresentation, SlideElement, SlideType, TextRun
 from pptx2md.utils import rgb_to_hex
 
+# Markdown 转义的触发字符集（与 _ESC_RE1 的字符类一致，外加 _ESC_RE2 的 '<'）。
+# translate 删除表用于 O(n) 的 C 级预检：长度不变说明没有任何待转义字符。
+_MD_META_TRANS = str.maketrans('', '', '!#()*+,-.[\\]_`{}<')
+_WIKI_META_TRANS = str.maketrans('', '', '<')
+
+_ratio = fuzz.ratio
+
+_quote = urllib.parse.quote
+
+
+@functools.lru_cache(maxsize=1024)
+def _quoted(path):
+    """图片路径的 URL 转义；同一路径在多页复用图片时直接取缓存。"""
+    return _quote(path)
+
+# 元素遍历热循环里最频繁比较的枚举成员，提为模块常量（枚举是单例，用 is 比较）
+_LIST_ITEM = ElementType.ListItem
+
+# 有序列表计数槽数：实际层级极少超过 16，超深时按需扩容
+_COUNTER_LEVELS = 16
+
+# 列表缩进与无序项前缀按层级预生成，热路径零字符串乘法
+_INDENTS = tuple('  ' * i for i in range(16))
+_BULLET_PREFIXES = tuple(ind + '* ' for ind in _INDENTS)
+
+
+def _titles_similar(a: str, b: str) -> bool:
+    """标题相似判定（阈值 92 分），模糊匹配前先做零成本预检。
+
+    相等直接命中；长度差悬殊时 ratio 的上界 2·min/(min+max) 够不到 92 分，
+    无需进编辑距离计算。
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if la > lb:
+        la, lb = lb, la
+    if 200 * la < 92 * (la + lb):
+        return False
+    return bool(_ratio(a, b, score_cutoff=92))
+
+
+class _OutputState:
+    """输出循环的跨元素状态。"""
+
+    __slots__ = ('last_element', 'last_title', 'ordered_counters', 'first_title_seen')
+
+    def __init__(self):
+        self.last_element = None
+        self.last_title = None
+        self.ordered_counters = [None] * _COUNTER_LEVELS
+        self.first_title_seen = False
+
 
 class Formatter:
 
     def __init__(self, config: ConversionConfig):
-        os.makedirs(config.output_path.parent, exist_ok=True)
-        self.ofile = open(config.output_path, 'w', encoding='utf8', newline='')
+        # 目录通常已存在：一次 is_dir 探测替代 makedirs 对每级路径的 stat
+        parent = config.output_path.parent
+        if not parent.is_dir():
+            parent.mkdir(parents=True, exist_ok=True)
+        # put_* 都是小片段写入，1 MiB 缓冲把上千次小 write 合并为少量系统调用；
+        # 提前 fspath 展开，open 内部不再走 PurePath.__fspath__
+        self.ofile = open(os.fspath(config.output_path), 'w', encoding='utf8', newline='', buffering=1 << 20)
         self.config = config
+        # 元素级写入先进内存缓冲，每张幻灯片结束时一次性写出，
+        # 减少 TextIOWrapper 的加锁与编码次数
+        self._buf: list[str] = []
+        # 流式空行压缩状态：_carry 悬置当前文件尾部的空行串（可能被后续
+        # 内容续上，也可能在 close 时收敛为一个换行）
+        self._compress = config.compress_blank_lines
+        self._carry = ''
+        self._content_started = False
+        # 模板里的页脚/作者名等文本在全片反复出现，缓存转义与整段格式化结果
+        self._escape_cache: dict = {}
+        self._runs_cache: dict = {}
+        # 元素类型 -> 处理方法 的分发表，构建一次；比逐元素 match/case 少一轮
+        # 分支比较和属性访问
+        self._handlers = {
+            ElementType.Title: self._handle_title,
+            ElementType.ListItem: self._handle_list_item,
+            ElementType.Paragraph: self._handle_paragraph,
+            ElementType.Image: self._handle_image,
+            ElementType.Table: self._handle_table,
+        }
 
     def output(self, presentation_data: ParsedPresentation):
         self.put_header()
 
-        last_element = None
-        last_title = None
-        ordered_counters = {}
-        first_title_seen = False
+        state = _OutputState()
         for slide_idx, slide in enumerate(presentation_data.slides):
             # 输出幻灯片编号注释（1-based）
             if not self.config.disable_slide_number:
@@ -50,58 +126,11 @@ class Formatter:
             elif slide.type == SlideType.MultiColumn:
                 all_elements = slide.preface + slide.columns
 
+            n = len(all_elements)
+            emit = self._emit_element
             for elem_idx, element in enumerate(all_elements):
-                next_elem = all_elements[elem_idx + 1] if elem_idx + 1 < len(all_elements) else None
-
-                if last_element and last_element.type == ElementType.ListItem and element.type != ElementType.ListItem:
-                    self.put_list_footer()
-                    ordered_counters = {}
-
-                match element.type:
-                    case ElementType.Title:
-                        element.content = element.content.strip()
-                        if element.content:
-                            # 首个标题保持原级别，后续标题降一级
-                            effective_level = element.level if not first_title_seen else element.level + 1
-                            if last_title and last_title.level == element.level and fuzz.ratio(
-                                    last_title.content, element.content, score_cutoff=92):
-                                # 如果标题与上一个相同则跳过
-                                # 允许重复幻灯片标题 - 添加 (cont.) 后缀
-                                if self.config.keep_similar_titles:
-                                    self.put_title(f'{element.content} (cont.)', effective_level)
-                            else:
-                                self.put_title(element.content, effective_level)
-                            last_title = element
-                            first_title_seen = True
-                    case ElementType.ListItem:
-                        if not (last_element and last_element.type == ElementType.ListItem):
-                            # 前一个元素是段落时跳过列表头空行（段落已提供换行）
-                            if not (last_element and last_element.type == ElementType.Paragraph):
-                                self.put_list_header()
-                            ordered_counters = {}
-                        list_type = getattr(element, 'list_type', ListType.Unordered)
-                        if list_type == ListType.Ordered:
-                            level = element.level
-                            explicit_number = getattr(element, 'list_number', None)
-                            ordered_counters[level] = self._resolve_ordered_list_number(
-                                ordered_counters, level, explicit_number
-                            )
-                            self.put_list(self.get_formatted_runs(element.content), element.level,
-                                          list_type=list_type, list_number=ordered_counters[level])
-                        else:
-                            self.put_list(self.get_formatted_runs(element.content), element.level)
-                    case ElementType.Paragraph:
-                        text = self.get_formatted_runs(element.content)
-                        # 段落后紧跟列表时，用单换行实现紧凑排版
-                        if next_elem and next_elem.type == ElementType.ListItem:
-                            self.write(text + '\n')
-                        else:
-                            self.put_para(text)
-                    case ElementType.Image:
-                        self.put_image(element.path, element.width)
-                    case ElementType.Table:
-                        self.put_table([[self.get_formatted_runs(cell) for cell in row] for row in element.content])
-                last_element = element
+                next_elem = all_elements[elem_idx + 1] if elem_idx + 1 < n else None
+                emit(element, next_elem, state)
 
             notes_written = not self.config.disable_notes and slide.notes
             if notes_written:
@@ -111,38 +140,121 @@ class Formatter:
 
             if slide_idx < len(presentation_data.slides) - 1 and self.config.enable_slides:
                 # 列表项以 \n 结尾，补一个 \n 保证分隔符前有一行空行
+                last_element = state.last_element
                 if last_element and last_element.type == ElementType.ListItem and not notes_written:
                     self.write('\n')
-                    ordered_counters = {}
+                    state.ordered_counters = [None] * _COUNTER_LEVELS
                 self.write('---\n\n')
                 # 重置为虚拟段落，防止跨幻灯片列表头/尾产生多余空行
-                last_element = ParagraphElement(content=[])
+                state.last_element = ParagraphElement(content=[])
+
+            self._flush_buf()
 
         self.close()
 
+    # ------------------------------------------------------------------
+    # 逐元素分发
+    # ------------------------------------------------------------------
+
+    def _emit_element(self, element, next_elem, state: _OutputState):
+        etype = element.type
+        last_element = state.last_element
+        if last_element is not None and last_element.type is _LIST_ITEM and etype is not _LIST_ITEM:
+            self.put_list_footer()
+            state.ordered_counters = [None] * _COUNTER_LEVELS
+
+        handler = self._handlers.get(etype)
+        if handler is not None:
+            handler(element, next_elem, state)
+        state.last_element = element
+
+    def _handle_title(self, element, next_elem, state: _OutputState):
+        element.content = element.content.strip()
+        if element.content:
+            # 首个标题保持原级别，后续标题降一级
+            effective_level = element.level if not state.first_title_seen else element.level + 1
+            last_title = state.last_title
+            if last_title and last_title.level == element.level and _titles_similar(
+                    last_title.content, element.content):
+                # 如果标题与上一个相同则跳过
+                # 允许重复幻灯片标题 - 添加 (cont.) 后缀
+                if self.config.keep_similar_titles:
+                    self.put_title(f'{element.content} (cont.)', effective_level)
+            else:
+                self.put_title(element.content, effective_level)
+            state.last_title = element
+            state.first_title_seen = True
+
+    def _handle_list_item(self, element, next_elem, state: _OutputState):
+        last_element = state.last_element
+        if not (last_element and last_element.type == ElementType.ListItem):
+            # 前一个元素是段落时跳过列表头空行（段落已提供换行）
+            if not (last_element and last_element.type == ElementType.Paragraph):
+                self.put_list_header()
+            state.ordered_counters = [None] * _COUNTER_LEVELS
+        # ListItemElement 保证两个字段都有默认值，直接访问即可
+        list_type = element.list_type
+        if list_type == ListType.Ordered:
+            level = element.level
+            explicit_number = element.list_number
+            list_number = self._resolve_ordered_list_number(state.ordered_counters, level, explicit_number)
+            self.put_list(self.get_formatted_runs(element.content), level,
+                          list_type=list_type, list_number=list_number)
+        else:
+            self.put_list(self.get_formatted_runs(element.content), element.level)
+
+    def _handle_paragraph(self, element, next_elem, state: _OutputState):
+        content = element.content
+        if not content:
+            # 空段落只产出占位空白行，跳过整个 run 格式化与缓存路径
+            if next_elem and next_elem.type is _LIST_ITEM:
+                self.write('\n')
+            else:
+                self.put_para('')
+            return
+        text = self.get_formatted_runs(content)
+        # 段落后紧跟列表时，用单换行实现紧凑排版
+        if next_elem and next_elem.type == ElementType.ListItem:
+            self.write(text + '\n')
+        else:
+            self.put_para(text)
+
+    def _handle_image(self, element, next_elem, state: _OutputState):
+        self.put_image(element.path, element.width)
+
+    def _handle_table(self, element, next_elem, state: _OutputState):
+        # 绑定局部名，省去每个单元格一次的属性查找
+        fmt = self.get_formatted_runs
+        self.put_table([[fmt(cell) for cell in row] for row in element.content])
+
     def put_header(self):
         pass
 
     @staticmethod
     def _resolve_ordered_list_number(ordered_counters, level, explicit_number=None):
-        current = ordered_counters.get(level)
+        # 计数器是以层级为下标的定长列表，索引访问替代字典哈希
+        if level >= len(ordered_counters):
+            ordered_counters.extend([None] * (level + 1 - len(ordered_counters)))
+        current = ordered_counters[level]
         if explicit_number is None:
-            ordered_counters[level] = (current or 0) + 1
+            n = (current or 0) + 1
         elif current is None:
             # 首项使用显式 startAt 作为种子。
-            ordered_counters[level] = explicit_number
+            n = explicit_number
         elif explicit_number <= current:
             # 部分 PPT 模板会给同一连续列表的每一项重复写入相同 startAt，
             # 这里按“连续编号”推进，避免 3,3,3,3。
-            ordered_counters[level] = current + 1
+            n = current + 1
         else:
             # 显式编号向前跳跃（如手动重设为更大数字）时，尊重源文档。
-            ordered_counters[level] = explicit_number
+            n = explicit_number
+        ordered_counters[level] = n
 
-        for deeper_level in [k for k in ordered_counters if k > level]:
-            ordered_counters.pop(deeper_level, None)
+        # 回到浅层级后，更深层级的计数重新开始
+        for i in range(level + 1, len(ordered_counters)):
+            ordered_counters[i] = None
 
-        return ordered_counters[level]
+        return n
 
     def put_title(self, text, level):
         pass
@@ -206,17 +318,52 @@ class Formatter:
             merged_runs.append(run.model_copy())
         return merged_runs
 
+    _ESCAPE_CACHE_MAX = 4096
+    _RUNS_CACHE_MAX = 2048
+
+    def _escape_cached(self, text):
+        cache = self._escape_cache
+        res = cache.get(text)
+        if res is None:
+            res = self.get_escaped(text)
+            if len(cache) >= self._ESCAPE_CACHE_MAX:
+                cache.clear()
+            cache[text] = res
+        return res
+
     def get_formatted_runs(self, runs: List[TextRun]):
-        res = ''
+        if not runs:
+            return ''
+        key = tuple((r.text, r.style.is_math, r.style.is_accent, r.style.is_strong, r.style.hyperlink,
+                     r.style.color_rgb) for r in runs)
+        cache = self._runs_cache
+        try:
+            cached = cache.get(key)
+        except TypeError:
+            # 样式里出现不可哈希对象时放弃缓存，直接格式化
+            return self._format_runs(runs)
+        if cached is not None:
+            return cached
+
+        res = self._format_runs(runs)
+        if len(cache) >= self._RUNS_CACHE_MAX:
+            # 先进先出淘汰最早条目，限制内存占用
+            cache.pop(next(iter(cache)))
+        cache[key] = res
+        return res
+
+    def _format_runs(self, runs: List[TextRun]):
+        # 逐段 append 后一次 join，避免 += 反复重建整串（run 多时是 O(n²)）
+        parts = []
         for run in self._merge_adjacent_runs(runs):
             text = run.text
 
             if run.style.is_math:
-                res += self.get_math(text)
+                parts.append(self.get_math(text))
                 continue
 
             if not self.config.disable_escaping:
-                text = self.get_escaped(text)
+                text = self._escape_cached(text)
 
             if run.style.hyperlink:
                 text = self._wrap_preserving_edge_whitespace(
@@ -233,8 +380,8 @@ class Formatter:
                     lambda value, rgb=run.style.color_rgb: self.get_colored(value, rgb),
                 )
 
-            res += text
-        return res.strip()
+            parts.append(text)
+        return ''.join(parts).strip()
 
     def put_para(self, text):
         pass
@@ -264,84 +411,116 @@ class Formatter:
         return f' ${text}$ '
 
     def write(self, text):
-        self.ofile.write(text)
+        self._buf.append(text)
+
+    def _flush_buf(self):
+        if not self._buf:
+            return
+        chunk = ''.join(self._buf)
+        self._buf.clear()
+        if self._compress:
+            self._write_compressed(chunk)
+        else:
+            self.ofile.write(chunk)
+
+    def _write_compressed(self, chunk):
+        """边写边压缩空行，免去 close 时整个文件的回读重写。
+
+        不变式：已落盘内容总是终止于非空白字符——文件尾的空行串悬置在
+        _carry 里等待后续内容。因此每个 chunk 内部的空行串都是完整的，
+        两条正则可直接在 chunk 上收敛。
+        """
+        chunk = self._carry + chunk
+        self._carry = ''
+        if chunk.endswith('\r'):
+            # \r\n 可能被 flush 边界拆开，悬置 \r 等待下一块的 \n
+            self._carry = '\r'
+            chunk = chunk[:-1]
+        if '\r' in chunk:
+            chunk = chunk.replace('\r\n', '\n')
+        m = _TRAILING_BLANK_RE.search(chunk)
+        if m:
+            self._carry = chunk[m.start():] + self._carry
+            chunk = chunk[:m.start()]
+        if not chunk:
+            return
+        if not self._content_started:
+            if not chunk.strip(' \t'):
+                # 尚无正文且全是行内空白，继续悬置
+                self._carry = chunk + self._carry
+                return
+            # 文件头的空行串收敛为一个空行
+            chunk = _LEADING_BLANK_RE.sub('\n', chunk)
+            self._content_started = True
+        self.ofile.write(_BLANK_RUN_RE.sub('\n\n', chunk))
+
+    def _finish_compression(self):
+        """close 时收敛悬置的文件尾。"""
+        tail = self._carry
+        self._carry = ''
+        if not tail:
+            return
+        if tail.endswith('\r'):
+            # 孤立 \r 是正文字符，压缩其前面的空行串后照常落盘
+            self.ofile.write(_BLANK_RUN_RE.sub('\n\n', tail))
+        elif self._content_started:
+            # 文件尾的连续空行（含仅空白的行）收敛为一个换行
+            self.ofile.write('\n')
+        elif tail.endswith('\n'):
+            # 纯空白文件：按是否以换行结尾保留一个换行
+            self.ofile.write('\n')
 
     def flush(self):
+        self._flush_buf()
         self.ofile.flush()
 
     def close(self):
+        self._flush_buf()
+        if self._compress:
+            self._finish_compression()
         self.ofile.close()
-        if self.config.compress_blank_lines:
-            _compress_output_blank_lines(self.config.output_path)
-
-
-def _compress_output_blank_lines(output_path):
-    """将输出文件中的连续空行压缩为 1 行空行。"""
-    with open(output_path, 'r', encoding='utf8', newline='') as f:
-        original = f.read()
 
-    # 统一换行符后进行处理，避免 Windows \r\n 与 \n 混用导致边界错误。
-    normalized = original.replace('\r\n', '\n')
-    lines = normalized.split('\n')
 
-    out_lines = []
-    last_was_blank = False
-    for line in lines:
-        is_blank = line.strip() == ''
-        if is_blank:
-            if last_was_blank:
-                continue
-            out_lines.append('')
-            last_was_blank = True
-        else:
-            out_lines.append(line)
-            last_was_blank = False
-
-    compressed = '\n'.join(out_lines)
-
-    # 保持“文件末尾是否有换行”与原始一致。
-    if original.endswith('\n') or original.endswith('\r\n'):
-        if not compressed.endswith('\n'):
-            compressed += '\n'
-
-    if compressed == normalized:
-        return
-
-    with open(output_path, 'w', encoding='utf8', newline='') as f:
-        f.write(compressed)
+# 空行压缩用的三条 C 级正则：行中连续空行、文件头、文件尾（含仅空白的行）
+_BLANK_RUN_RE = re.compile(r'\n(?:[ \t]*\n)+')
+_LEADING_BLANK_RE = re.compile(r'\A(?:[ \t]*\n)+')
+_TRAILING_BLANK_RE = re.compile(r'(?:\n[ \t]*)+\Z')
 
 
 class MarkdownFormatter(Formatter):
     # 将输出写入 Markdown 格式
-    def __init__(self, config: ConversionConfig):
-        super().__init__(config)
-        self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
+
+    # 转义用正则在类级编译一次，所有实例共享
+    _ESC_RE1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
+    _ESC_RE2 = re.compile(r'(<[^>]+>)')
 
     def put_title(self, text, level):
-        self.ofile.write('#' * level + ' ' + text + '\n\n')
+        self.write('#' * level + ' ' + text + '\n\n')
 
     def put_list(self, text, level, list_type=ListType.Unordered, list_number=None):
-        indent = '  ' * level
         if list_type == ListType.Ordered and list_number is not None:
-            self.ofile.write(f'{indent}{list_number}. {text.strip()}\n')
+            indent = _INDENTS[level] if level < 16 else '  ' * level
+            self.write(f'{indent}{list_number}. {text.strip()}\n')
+        elif level < 16:
+            self.write(_BULLET_PREFIXES[level] + text.strip() + '\n')
         else:
-            self.ofile.write(indent + '* ' + text.strip() + '\n')
+            self.write('  ' * level + '* ' + text.strip() + '\n')
 
     def put_para(self, text):
-        self.ofile.write(text + '\n\n')
+        self.write(text + '\n\n')
 
     def put_image(self, path, max_width=None):
         if max_width is None:
-            self.ofile.write(f'![]({urllib.parse.quote(path)})\n\n')
+            self.write(f'![]({_quoted(path)})\n\n')
         else:
-            self.ofile.write(f'<img src="{path}" style="max-width:{max_width}px;" />\n\n')
+            self.write(f'<img src="{path}" style="max-width:{max_width}px;" />\n\n')
 
     def put_table(self, table):
         gen_table_row = lambda row: '| ' + ' | '.join([c.replace('\n', '<br />') for c in row]) + ' |'
-        self.ofile.write(gen_table_row(table[0]) + '\n')
-        self.ofile.write(gen_table_row([':-:' for _ in table[0]]) + '\n')
-        self.ofile.write('\n'.join([gen_table_row(row) for row in table[1:]]) + '\n\n')
+        # 表头、分隔行、数据行拼成整块后一次写入
+        rows = [gen_table_row(table[0]), gen_table_row([':-:' for _ in table[0]])]
+        rows.extend(gen_table_row(row) for row in table[1:])
+        self.write('\n'.join(rows) + '\n\n')
 
     def get_accent(self, text):
         return '*' + text + '*'
@@ -355,38 +534,38 @@ class MarkdownFormatter(Formatter):
     def get_hyperlink(self, text, url):
         return '[' + text + '](' + url + ')'
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
+        # 普通正文大多不含元字符：一趟 translate 预检命中则原样返回，零分配
+        if len(text.translate(_MD_META_TRANS)) == len(text):
+            return text
+        # 模板替换在 C 层展开，免去每个命中一次的 Python 回调
+        text = self._ESC_RE1.sub(r'\\\g<0>', text)
+        text = self._ESC_RE2.sub(r'\\\g<0>', text)
         return text
 
 
 class WikiFormatter(Formatter):
     # 将输出写入 wikitext 格式
-    def __init__(self, config: ConversionConfig):
-        super().__init__(config)
-        self.esc_re = re.compile(r'<([^>]+)>')
+
+    _ESC_RE = re.compile(r'<([^>]+)>')
 
     def put_title(self, text, level):
-        self.ofile.write('!' * level + ' ' + text + '\n\n')
+        self.write('!' * level + ' ' + text + '\n\n')
 
     def put_list(self, text, level, list_type=ListType.Unordered, list_number=None):
         if list_type == ListType.Ordered:
-            self.ofile.write('#' * (level + 1) + ' ' + text.strip() + '\n')
+            self.write('#' * (level + 1) + ' ' + text.strip() + '\n')
         else:
-            self.ofile.write('*' * (level + 1) + ' ' + text.strip() + '\n')
+            self.write('*' * (level + 1) + ' ' + text.strip() + '\n')
 
     def put_para(self, text):
-        self.ofile.write(text + '\n\n')
+        self.write(text + '\n\n')
 
     def put_image(self, path, max_width):
         if max_width is None:
-            self.ofile.write(f'<img src="{path}" />\n\n')
+            self.write(f'<img src="{path}" />\n\n')
         else:
-            self.ofile.write(f'<img src="{path}" width={max_width}px />\n\n')
+            self.write(f'<img src="{path}" width={max_width}px />\n\n')
 
     def get_accent(self, text):
         return ' __' + text + '__ '
@@ -400,44 +579,47 @@ class WikiFormatter(Formatter):
     def get_hyperlink(self, text, url):
         return '[[' + text + '|' + url + ']]'
 
-    def esc_repl(self, match):
-        return "''''" + match.group(0)
-
     def get_escaped(self, text):
-        text = re.sub(self.esc_re, self.esc_repl, text)
+        if len(text.translate(_WIKI_META_TRANS)) == len(text):
+            return text
+        # 模板替换在 C 层展开；\g<0> 含尖括号本身，与原回调一致
+        text = self._ESC_RE.sub(r"''''\g<0>", text)
         return text
 
 
 class MadokoFormatter(Formatter):
     # 将输出写入 Madoko Markdown 格式
+    _ESC_RE1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
+    _ESC_RE2 = re.compile(r'(<[^>]+>)')
+
     def __init__(self, config: ConversionConfig):
         super().__init__(config)
-        self.ofile.write('[TOC]\n\n')
-        self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
+        self.write('[TOC]\n\n')
 
     def put_title(self, text, level):
-        self.ofile.write('#' * level + ' ' + text + '\n\n')
+        self.write('#' * level + ' ' + text + '\n\n')
 
     def put_list(self, text, level, list_type=ListType.Unordered, list_number=None):
-        indent = '  ' * level
         if list_type == ListType.Ordered and list_number is not None:
-            self.ofile.write(f'{indent}{list_number}. {text.strip()}\n')
+            indent = _INDENTS[level] if level < 16 else '  ' * level
+            self.write(f'{indent}{list_number}. {text.strip()}\n')
+        elif level < 16:
+            self.write(_BULLET_PREFIXES[level] + text.strip() + '\n')
         else:
-            self.ofile.write(indent + '* ' + text.strip() + '\n')
+            self.write('  ' * level + '* ' + text.strip() + '\n')
 
     def put_para(self, text):
-        self.ofile.write(text + '\n\n')
+        self.write(text + '\n\n')
 
     def put_image(self, path, max_width):
         if max_width is None:
-            self.ofile.write(f'<img src="{path}" />\n\n')
+            self.write(f'<img src="{path}" />\n\n')
         elif max_width < 500:
-            self.ofile.write(f'<img src="{path}" width={max_width}px />\n\n')
+            self.write(f'<img src="{path}" width={max_width}px />\n\n')
         else:
-            self.ofile.write('~ Figure {caption: image caption}\n')
-            self.ofile.write('![](%s){width:%spx;}\n' % (path, max_width))
-            self.ofile.write('~\n\n')
+            self.write('~ Figure {caption: image caption}\n')
+            self.write('![](%s){width:%spx;}\n' % (path, max_width))
+            self.write('~\n\n')
 
     def get_accent(self, text):
         return '*' + text + '*'
@@ -451,84 +633,46 @@ class MadokoFormatter(Formatter):
     def get_hyperlink(self, text, url):
         return '[' + text + '](' + url + ')'
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
+        # 普通正文大多不含元字符：一趟 translate 预检命中则原样返回，零分配
+        if len(text.translate(_MD_META_TRANS)) == len(text):
+            return text
+        # 模板替换在 C 层展开，免去每个命中一次的 Python 回调
+        text = self._ESC_RE1.sub(r'\\\g<0>', text)
+        text = self._ESC_RE2.sub(r'\\\g<0>', text)
         return text
 
 
 class QuartoFormatter(Formatter):
     # 将输出写入 Quarto Markdown 格式 - reveal.js
-    def __init__(self, config: ConversionConfig):
-        super().__init__(config)
-        self.esc_re1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
-        self.esc_re2 = re.compile(r'(<[^>]+>)')
+
+    _ESC_RE1 = re.compile(r'([\\\*`!_\{\}\[\]\(\)#\+-\.])')
+    _ESC_RE2 = re.compile(r'(<[^>]+>)')
+
+    # 多栏布局的围栏片段是固定文本，类级预拼好，避免每张幻灯片重建 f-string
+    _COLUMNS_OPEN = ':::: {.columns}\n\n'
+    _COLUMNS_CLOSE = '::::\n\n'
+    _COLUMN_OPEN = {
+        2: '::: {.column width="50%"}\n\n',
+        3: '::: {.column width="33%"}\n\n',
+    }
+    _COLUMN_CLOSE = ':::\n\n'
 
     def output(self, presentation_data: ParsedPresentation):
         self.put_header()
 
-        last_title = None
-        first_title_seen = False
+        # 标题去重状态跨元素段共享；last_element/ordered_counters 每段重置
+        state = _OutputState()
 
         def put_elements(elements: List[SlideElement], initial_last_element=None):
-            nonlocal last_title, first_title_seen
-
-            last_element = initial_last_element
-            ordered_counters = {}
+            state.last_element = initial_last_element
+            state.ordered_counters = [None] * _COUNTER_LEVELS
+            n = len(elements)
+            emit = self._emit_element
             for elem_idx, element in enumerate(elements):
-                next_elem = elements[elem_idx + 1] if elem_idx + 1 < len(elements) else None
-
-                if last_element and last_element.type == ElementType.ListItem and element.type != ElementType.ListItem:
-                    self.put_list_footer()
-                    ordered_counters = {}
-
-                match element.type:
-                    case ElementType.Title:
-                        element.content = element.content.strip()
-                        if element.content:
-                            # 首个标题保持原级别，后续标题降一级
-                            effective_level = element.level if not first_title_seen else element.level + 1
-                            if last_title and last_title.level == element.level and fuzz.ratio(
-                                    last_title.content, element.content, score_cutoff=92):
-                                # 如果标题与上一个相同则跳过
-                                # 允许重复幻灯片标题 - 添加 (cont.) 后缀
-                                if self.config.keep_similar_titles:
-                                    self.put_title(f'{element.content} (cont.)', effective_level)
-                            else:
-                                self.put_title(element.content, effective_level)
-                            last_title = element
-                            first_title_seen = True
-                    case ElementType.ListItem:
-                        if not (last_element and last_element.type == ElementType.ListItem):
-                            if not (last_element and last_element.type == ElementType.Paragraph):
-                                self.put_list_header()
-                            ordered_counters = {}
-                        list_type = getattr(element, 'list_type', ListType.Unordered)
-                        if list_type == ListType.Ordered:
-                            level = element.level
-                            explicit_number = getattr(element, 'list_number', None)
-                            ordered_counters[level] = self._resolve_ordered_list_number(
-                                ordered_counters, level, explicit_number
-                            )
-                            self.put_list(self.get_formatted_runs(element.content), element.level,
-                                          list_type=list_type, list_number=ordered_counters[level])
-                        else:
-                            self.put_list(self.get_formatted_runs(element.content), element.level)
-                    case ElementType.Paragraph:
-                        text = self.get_formatted_runs(element.content)
-                        if next_elem and next_elem.type == ElementType.ListItem:
-                            self.write(text + '\n')
-                        else:
-                            self.put_para(text)
-                    case ElementType.Image:
-                        self.put_image(element.path, element.width)
-                    case ElementType.Table:
-                        self.put_table([[self.get_formatted_runs(cell) for cell in row] for row in element.content])
-                last_element = element
-            return last_element
+                next_elem = elements[elem_idx + 1] if elem_idx + 1 < n else None
+                emit(element, next_elem, state)
+            return state.last_element
 
         after_separator = False
         for slide_idx, slide in enumerate(presentation_data.slides):
@@ -543,19 +687,16 @@ class QuartoFormatter(Formatter):
                 slide_last_element = put_elements(slide.elements, init_last)
             elif slide.type == SlideType.MultiColumn:
                 put_elements(slide.preface, init_last)
-                if len(slide.columns) == 2:
-                    width = '50%'
-                elif len(slide.columns) == 3:
-                    width = '33%'
-                else:
+                column_open = self._COLUMN_OPEN.get(len(slide.columns))
+                if column_open is None:
                     raise ValueError(f'Unsupported number of columns: {len(slide.columns)}')
 
-                self.put_para(':::: {.columns}')
+                self.write(self._COLUMNS_OPEN)
                 for column in slide.columns:
-                    self.put_para(f'::: {{.column width="{width}"}}')
+                    self.write(column_open)
                     put_elements(column)
-                    self.put_para(':::')
-                self.put_para('::::')
+                    self.write(self._COLUMN_CLOSE)
+                self.write(self._COLUMNS_CLOSE)
 
             notes_written = not self.config.disable_notes and slide.notes
             if notes_written:
@@ -571,10 +712,12 @@ class QuartoFormatter(Formatter):
                 self.write('---\n\n')
                 after_separator = True
 
+            self._flush_buf()
+
         self.close()
 
     def put_header(self):
-        self.ofile.write('''---
+        self.write('''---
 title: "Presentation Title"
 author: "Author"
 format:
@@ -590,29 +733,32 @@ format:
 ''')
 
     def put_title(self, text, level):
-        self.ofile.write('#' * level + ' ' + text + '\n\n')
+        self.write('#' * level + ' ' + text + '\n\n')
 
     def put_list(self, text, level, list_type=ListType.Unordered, list_number=None):
-        indent = '  ' * level
         if list_type == ListType.Ordered and list_number is not None:
-            self.ofile.write(f'{indent}{list_number}. {text.strip()}\n')
+            indent = _INDENTS[level] if level < 16 else '  ' * level
+            self.write(f'{indent}{list_number}. {text.strip()}\n')
+        elif level < 16:
+            self.write(_BULLET_PREFIXES[level] + text.strip() + '\n')
         else:
-            self.ofile.write(indent + '* ' + text.strip() + '\n')
+            self.write('  ' * level + '* ' + text.strip() + '\n')
 
     def put_para(self, text):
-        self.ofile.write(text + '\n\n')
+        self.write(text + '\n\n')
 
     def put_image(self, path, max_width=None):
         if max_width is None:
-            self.ofile.write(f'![]({urllib.parse.quote(path)})\n\n')
+            self.write(f'![]({_quoted(path)})\n\n')
         else:
-            self.ofile.write(f'<img src="{path}" style="max-width:{max_width}px;" />\n\n')
+            self.write(f'<img src="{path}" style="max-width:{max_width}px;" />\n\n')
 
     def put_table(self, table):
         gen_table_row = lambda row: '| ' + ' | '.join([c.replace('\n', '<br />') for c in row]) + ' |'
-        self.ofile.write(gen_table_row(table[0]) + '\n')
-        self.ofile.write(gen_table_row([':-:' for _ in table[0]]) + '\n')
-        self.ofile.write('\n'.join([gen_table_row(row) for row in table[1:]]) + '\n\n')
+        # 表头、分隔行、数据行拼成整块后一次写入
+        rows = [gen_table_row(table[0]), gen_table_row([':-:' for _ in table[0]])]
+        rows.extend(gen_table_row(row) for row in table[1:])
+        self.write('\n'.join(rows) + '\n\n')
 
     def get_accent(self, text):
         return '*' + text + '*'
@@ -626,10 +772,11 @@ format:
     def get_hyperlink(self, text, url):
         return '[' + text + '](' + url + ')'
 
-    def esc_repl(self, match):
-        return '\\' + match.group(0)
-
     def get_escaped(self, text):
-        text = re.sub(self.esc_re1, self.esc_repl, text)
-        text = re.sub(self.esc_re2, self.esc_repl, text)
+        # 普通正文大多不含元字符：一趟 translate 预检命中则原样返回，零分配
+        if len(text.translate(_MD_META_TRANS)) == len(text):
+            return text
+        # 模板替换在 C 层展开，免去每个命中一次的 Python 回调
+        text = self._ESC_RE1.sub(r'\\\g<0>', text)
+        text = self._ESC_RE2.sub(r'\\\g<0>', text)
         return text
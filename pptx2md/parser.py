@@ -16,6 +16,7 @@
 
 from __future__ import print_function
 
+import hashlib
 import logging
 import os
 import shutil
@@ -56,7 +57,7 @@ from pptx2md.types import (
 logger = logging.getLogger(__name__)
 
 picture_count = 0
-_SLIDE_SIZE_EMU_CACHE: dict[str, tuple[int, int]] = {}
+_SLIDE_SIZE_EMU_CACHE: dict[tuple[str, float], tuple[int, int]] = {}
 _PPT_COM_SESSION = None
 _WMF_COM_FALLBACK_STATE: bool | None = None  # None=未探测/未尝试, True=可用, False=不可用/禁用
 _WMF_COM_FALLBACK_REASON_LOGGED = False
@@ -100,7 +101,7 @@ class _PowerPointComSession:
         try:
             com_slide = self._pres.Slides(slide_idx)  # 1-based
             com_slide.Export(normalized_slide_png_path, "PNG", width_px, height_px)
-            return os.path.exists(normalized_slide_png_path) and os.path.getsize(normalized_slide_png_path) > 0
+            return _is_nonempty_file(normalized_slide_png_path)
         except Exception:
             return False
 
@@ -120,9 +121,29 @@ class _PowerPointComSession:
         self._pptx_path = None
 
 
+# 图片输出路径上下文：(output_path, image_dir) -> commonpath 结果。
+# 目录创建和公共前缀计算每次转换只需做一次，不必每张图 stat 一遍。
+_IMAGE_PATH_CONTEXT: dict[tuple[str, str], str] = {}
+
+
+# 图片内容寻址索引：blob 哈希 -> (outputter 相对路径, original_ext)。
+# 同一张图（页眉 logo、页脚图标等）在多页重复引用时只落盘一次。
+# 路径与输出目录绑定，转换结束后随其他缓存一并清空。
+_IMAGE_HASH_INDEX: dict[bytes, tuple[str, str]] = {}
+
+
 def close_powerpoint_com_session():
-    """关闭全局 COM 会话，避免 PowerPoint 残留后台进程。"""
+    """关闭全局 COM 会话，避免 PowerPoint 残留后台进程。
+
+    同时清空本次转换期间的列表样式缓存与图片去重索引
+    （entry.convert 在 finally 中调用本函数，借此作为统一清理点）。
+    """
     global _PPT_COM_SESSION
+    _clear_list_style_caches()
+    _IMAGE_HASH_INDEX.clear()
+    _clear_slide_image_cache()
+    _TITLE_MATCH_CACHE.clear()
+    _IMAGE_PATH_CONTEXT.clear()
     try:
         if _PPT_COM_SESSION is not None:
             _PPT_COM_SESSION.close()
@@ -190,8 +211,13 @@ def _should_try_wmf_com_fallback() -> bool:
 
 
 def _get_slide_size_emu(pptx_path) -> tuple[int, int]:
-    """读取演示文稿的页面尺寸（EMU），用于将 shape 边界映射到导出的像素坐标。"""
-    key = os.path.abspath(str(pptx_path))
+    """读取演示文稿的页面尺寸（EMU），用于将 shape 边界映射到导出的像素坐标。
+
+    重新打开 pptx 意味着整包解压 + lxml 重解析，只为读两个整数，所以
+    缓存键带 mtime（文件被改写后自动失效），缓存值只存尺寸，不持有
+    Presentation/ZipFile。
+    """
+    key = (os.path.abspath(str(pptx_path)), os.path.getmtime(pptx_path))
     cached = _SLIDE_SIZE_EMU_CACHE.get(key)
     if cached:
         return cached
@@ -201,6 +227,14 @@ def _get_slide_size_emu(pptx_path) -> tuple[int, int]:
     return size
 
 
+def _is_nonempty_file(path) -> bool:
+    """单次 stat 判断文件存在且非空（代替 exists + getsize 两次系统调用）。"""
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
 def _env_int(name: str, default: int) -> int:
     try:
         v = int(os.environ.get(name, str(default)).strip())
@@ -223,6 +257,83 @@ def _env_str(name: str, default: str) -> str:
     return v.strip()
 
 
+def _collect_wmf_slide_indices(prs) -> List[int]:
+    """扫描整份演示文稿，返回引用了 WMF 图片的 1-based 页码列表。
+
+    通过 slide part 的关系表判断，不解码图片，成本只是几次字符串比较。
+    """
+    indices = []
+    for idx, slide in enumerate(prs.slides, start=1):
+        try:
+            for rel in slide.part.rels.values():
+                if rel.is_external:
+                    continue
+                partname = str(getattr(rel.target_part, 'partname', ''))
+                if partname.lower().endswith('.wmf'):
+                    indices.append(idx)
+                    break
+        except Exception:
+            continue
+    return indices
+
+
+def _export_wmf_slides_bulk(session, prs, slide_export_dir, width_px: int, height_px: int):
+    """把所有含 WMF 的页在同一 COM 会话内连续导出为 PNG。
+
+    每次 Export 的 IDispatch 往返开销是大头；首次走到 COM 兜底时一次性
+    导完，后续 shape 直接命中磁盘缓存，也不会在不同页之间来回切换。
+    """
+    for idx in _collect_wmf_slide_indices(prs):
+        slide_png = slide_export_dir / f"slide_{idx}_w{width_px}.png"
+        if slide_png.exists():
+            continue
+        session.export_slide_png(idx, os.path.abspath(str(slide_png)), width_px, height_px)
+
+
+# 整页导出 PNG 的解码缓存：同一页上有 K 个 WMF 时只解码一次整页位图。
+# 3840 宽的 RGB 位图解码后约几十 MB，因此只保留最近一页，换页即关闭释放。
+_SLIDE_IMG_CACHE: dict[str, Image.Image] = {}
+
+
+def _clear_slide_image_cache():
+    """关闭并清空整页导出图缓存。"""
+    for img in _SLIDE_IMG_CACHE.values():
+        try:
+            img.close()
+        except Exception:
+            pass
+    _SLIDE_IMG_CACHE.clear()
+
+
+def _get_slide_export_image(slide_png) -> Image.Image:
+    """按路径缓存打开整页导出 PNG（单条目，换页时自动淘汰上一页）。"""
+    key = os.path.abspath(str(slide_png))
+    img = _SLIDE_IMG_CACHE.get(key)
+    if img is None:
+        _clear_slide_image_cache()
+        img = Image.open(key)
+        img.load()
+        _SLIDE_IMG_CACHE[key] = img
+    return img
+
+
+# wand（可选依赖，打包时显式排除）：首次使用时尝试导入，
+# 失败缓存为 False，后续 WMF 不再重复走导入失败路径
+_WAND_IMAGE = None
+
+
+def _get_wand_image_class():
+    """返回 wand.image.Image，不可用时返回 False。"""
+    global _WAND_IMAGE
+    if _WAND_IMAGE is None:
+        try:
+            from wand.image import Image as WandImage  # type: ignore
+            _WAND_IMAGE = WandImage
+        except Exception:
+            _WAND_IMAGE = False
+    return _WAND_IMAGE
+
+
 def _convert_wmf_via_magick(input_wmf_path: str, output_path: str, dpi: int, jpg_quality: int) -> bool:
     """用 ImageMagick CLI 将 WMF 光栅化为 PNG/JPG（需要本机安装 magick 且支持 WMF）。"""
     magick = shutil.which("magick")
@@ -247,7 +358,7 @@ def _convert_wmf_via_magick(input_wmf_path: str, output_path: str, dpi: int, jpg
     cmd.append(output_path)
     try:
         subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return os.path.exists(output_path) and os.path.getsize(output_path) > 0
+        return _is_nonempty_file(output_path)
     except Exception:
         return False
 
@@ -260,7 +371,13 @@ def _convert_wmf_via_powerpoint_slide_export(config: ConversionConfig, shape, sl
     try:
         global _PPT_COM_SESSION
         global _WMF_COM_FALLBACK_STATE
-        slide_w_emu, slide_h_emu = _get_slide_size_emu(config.pptx_path)
+        # shape 能直接摸到已打开的 Presentation，优先从它读尺寸，不重开 pptx
+        open_prs = None
+        try:
+            open_prs = shape.part.package.main_document_part.presentation
+            slide_w_emu, slide_h_emu = int(open_prs.slide_width), int(open_prs.slide_height)
+        except Exception:
+            slide_w_emu, slide_h_emu = _get_slide_size_emu(config.pptx_path)
         export_width_px = _env_int("PPTX2MD_WMF_COM_EXPORT_WIDTH", 3840)
         export_height_px = max(1, int(round(export_width_px * slide_h_emu / slide_w_emu)))
 
@@ -280,6 +397,15 @@ def _convert_wmf_via_powerpoint_slide_export(config: ConversionConfig, shape, sl
                     export_width_px,
                     export_height_px,
                 )
+                # 会话已开：顺手把其余含 WMF 的页也导出，摊薄 COM 往返
+                if open_prs is not None:
+                    _export_wmf_slides_bulk(
+                        _PPT_COM_SESSION,
+                        open_prs,
+                        slide_export_dir,
+                        export_width_px,
+                        export_height_px,
+                    )
             except Exception as e:
                 logger.warning(f'PowerPoint COM fallback failed in slide {slide_idx}: {e}')
                 # 自动探测模式下，如果 COM 初始化失败，后续不再尝试
@@ -290,30 +416,31 @@ def _convert_wmf_via_powerpoint_slide_export(config: ConversionConfig, shape, sl
         if not slide_png.exists():
             return False
 
-        # EMU -> pixel 映射后裁剪
-        scale = export_width_px / float(slide_w_emu)
-        left = int(round(float(shape.left) * scale))
-        top = int(round(float(shape.top) * scale))
-        right = int(round((float(shape.left) + float(shape.width)) * scale))
-        bottom = int(round((float(shape.top) + float(shape.height)) * scale))
-
-        # 裁剪安全边界
-        with Image.open(slide_png) as slide_img:
-            w, h = slide_img.size
-            left = max(0, min(left, w - 1))
-            top = max(0, min(top, h - 1))
-            right = max(left + 1, min(right, w))
-            bottom = max(top + 1, min(bottom, h))
-
-            cropped = slide_img.crop((left, top, right, bottom))
-            ext = str(os.path.splitext(str(output_path))[1]).lower()
-            if ext in (".jpg", ".jpeg"):
-                cropped = cropped.convert("RGB")
-                cropped.save(output_path, quality=_env_int("PPTX2MD_WMF_JPEG_QUALITY", 92), optimize=True)
-            else:
-                cropped.save(output_path)
+        # EMU -> pixel 映射后裁剪（整数四舍五入乘除，不走浮点）
+        half = slide_w_emu // 2
+        shape_l, shape_t = int(shape.left), int(shape.top)
+        left = (shape_l * export_width_px + half) // slide_w_emu
+        top = (shape_t * export_width_px + half) // slide_w_emu
+        right = ((shape_l + int(shape.width)) * export_width_px + half) // slide_w_emu
+        bottom = ((shape_t + int(shape.height)) * export_width_px + half) // slide_w_emu
+
+        # 裁剪安全边界；整页位图走缓存，同页多个 WMF 不重复解码
+        slide_img = _get_slide_export_image(slide_png)
+        w, h = slide_img.size
+        left = max(0, min(left, w - 1))
+        top = max(0, min(top, h - 1))
+        right = max(left + 1, min(right, w))
+        bottom = max(top + 1, min(bottom, h))
+
+        cropped = slide_img.crop((left, top, right, bottom))
+        ext = str(os.path.splitext(str(output_path))[1]).lower()
+        if ext in (".jpg", ".jpeg"):
+            cropped = cropped.convert("RGB")
+            cropped.save(output_path, quality=_env_int("PPTX2MD_WMF_JPEG_QUALITY", 92), optimize=True)
+        else:
+            cropped.save(output_path)
 
-        return os.path.exists(output_path) and os.path.getsize(output_path) > 0
+        return _is_nonempty_file(output_path)
     except Exception:
         if os.environ.get("PPTX2MD_WMF_COM_FALLBACK") is None:
             _WMF_COM_FALLBACK_STATE = False
@@ -330,21 +457,68 @@ def is_title(shape):
 
 
 _NS_A14 = '{http://schemas.microsoft.com/office/drawing/2010/main}'
+_TAG_A14_M = f'{_NS_A14}m'
+_QN_A_T = qn('a:t')
+_QN_A_BR = qn('a:br')
+_QN_A_P = qn('a:p')
+_QN_A_R = qn('a:r')
+_QN_PPR = qn('a:pPr')
+_QN_BUNONE = qn('a:buNone')
+_QN_BUCHAR = qn('a:buChar')
+_QN_BUAUTO = qn('a:buAutoNum')
+_QN_LSTSTYLE = qn('a:lstStyle')
+_QN_NOTESSTYLE = qn('p:notesStyle')
+# lstStyle 的级别定义 a:lvl1pPr..a:lvl9pPr，按 level 直接索引
+_LVL_PPR = tuple(qn(f'a:lvl{i}pPr') for i in range(1, 10))
 
 
 def is_text_block(config: ConversionConfig, shape):
     if shape.has_text_frame:
         if shape.is_placeholder and shape.placeholder_format.type == PP_PLACEHOLDER.BODY:
             return True
-        if len(shape.text) > config.min_block_size:
-            return True
-        # 含公式的 shape（a14:m）也应被当作文本块处理，
-        # 因为 shape.text 不包含公式内容，会低估文本长度
-        if any(True for _ in shape._element.iter(f'{_NS_A14}m')):
-            return True
+        # shape.text 本身就是一次全子树拼接，原先算完长度还要再为 a14:m 扫第二趟。
+        # 这里单趟遍历同时累计文本长度（与 shape.text 一致：段落间补 \n、a:br 计 \v）
+        # 并检测公式，长度一过阈值立即返回
+        limit = config.min_block_size
+        total = -1  # 抵消首段多算的一个换行符
+        for el in shape._element.iter():
+            tag = el.tag
+            if tag == _QN_A_T:
+                total += len(el.text or '')
+                if total > limit:
+                    return True
+            elif tag == _QN_A_P or tag == _QN_A_BR:
+                total += 1
+                if total > limit:
+                    return True
+            elif tag == _TAG_A14_M:
+                # 含公式的 shape 也应被当作文本块处理，
+                # 因为 shape.text 不包含公式内容，会低估文本长度
+                return True
     return False
 
 
+def _para_has_content(p) -> Tuple[bool, bool]:
+    """单趟判断 a:p 是否含非空白文本与公式，返回 (has_text, has_math)。
+
+    等价于 para.text.strip() != '' 与逐子元素找 }m 的两次遍历。
+    """
+    has_text = False
+    has_math = False
+    for child in p:
+        if child.tag.endswith('}m'):
+            has_math = True
+            if has_text:
+                break
+        elif not has_text:
+            for t in child.iter(_QN_A_T):
+                text = t.text
+                if text and not text.isspace():
+                    has_text = True
+                    break
+    return has_text, has_math
+
+
 def _check_bullet_in_ppr(pPr):
     """检查段落属性元素中的项目符号类型。
 
@@ -352,11 +526,11 @@ def _check_bullet_in_ppr(pPr):
     """
     if pPr is None:
         return None
-    if pPr.find(qn('a:buNone')) is not None:
+    if pPr.find(_QN_BUNONE) is not None:
         return 'none'
-    if pPr.find(qn('a:buChar')) is not None:
+    if pPr.find(_QN_BUCHAR) is not None:
         return 'bullet'
-    bu_auto = pPr.find(qn('a:buAutoNum'))
+    bu_auto = pPr.find(_QN_BUAUTO)
     if bu_auto is not None:
         return 'numbered'
     return None
@@ -366,11 +540,41 @@ def _check_list_style_for_level(lst_style_elem, level):
     """在 <a:lstStyle> 元素中查找指定级别的项目符号定义。"""
     if lst_style_elem is None:
         return None
-    level_tag = qn(f'a:lvl{level + 1}pPr')
+    level_tag = _LVL_PPR[level] if level < len(_LVL_PPR) else qn(f'a:lvl{level + 1}pPr')
     lvl_ppr = lst_style_elem.find(level_tag)
     return _check_bullet_in_ppr(lvl_ppr)
 
 
+# 布局/母版列表样式查询缓存：同一演示文稿里几乎每个段落都会落到层级 3/4，
+# 而布局、母版对象在转换期间是稳定的，没必要每段都重新遍历占位符和 lstStyle。
+# 键含 id()，跨转换不能复用，convert 结束时统一清空。
+_LAYOUT_LST_CACHE: dict = {}
+_MASTER_LST_CACHE: dict = {}
+_NOTES_STYLE_CACHE: dict = {}
+
+
+def _clear_list_style_caches():
+    """清空布局/母版列表样式缓存（每次转换结束后调用）。"""
+    _LAYOUT_LST_CACHE.clear()
+    _MASTER_LST_CACHE.clear()
+    _NOTES_STYLE_CACHE.clear()
+
+
+def _inherited_list_style_result(cache, container, ph_idx, level):
+    """查找布局/母版中同 idx 占位符在指定级别的项目符号定义，结果缓存。"""
+    key = (id(container), ph_idx, level)
+    if key in cache:
+        return cache[key]
+    result = None
+    for ph in container.placeholders:
+        if ph.placeholder_format.idx == ph_idx:
+            lst = ph.text_frame._txBody.find(_QN_LSTSTYLE)
+            result = _check_list_style_for_level(lst, level)
+            break
+    cache[key] = result
+    return result
+
+
 def get_paragraph_bullet_type(para, shape=None):
     """检测单个段落的项目符号类型。
 
@@ -385,13 +589,16 @@ def get_paragraph_bullet_type(para, shape=None):
 
     返回: 'bullet'、'numbered' 或 'none'。
     """
-    level = para.level
-
     # 层级1：段落自身的显式设置
-    pPr = para._p.find(qn('a:pPr'))
-    explicit = _check_bullet_in_ppr(pPr)
+    explicit = _check_bullet_in_ppr(para._p.find(_QN_PPR))
     if explicit is not None:
         return explicit
+    return _inherited_bullet_type(para, shape)
+
+
+def _inherited_bullet_type(para, shape=None):
+    """项目符号检测的层级 2–7（段落自身无显式设置时的继承与启发式）。"""
+    level = para.level
 
     # 层级2：文本体的列表样式
     tx_body = None
@@ -400,7 +607,7 @@ def get_paragraph_bullet_type(para, shape=None):
             tx_body = shape.text_frame._txBody
         except Exception:
             tx_body = None
-    lst_style = tx_body.find(qn('a:lstStyle')) if tx_body is not None else None
+    lst_style = tx_body.find(_QN_LSTSTYLE) if tx_body is not None else None
     body_result = _check_list_style_for_level(lst_style, level)
     if body_result is not None:
         return body_result
@@ -410,25 +617,17 @@ def get_paragraph_bullet_type(para, shape=None):
         try:
             ph_idx = shape.placeholder_format.idx
             layout = shape.part.slide_layout
-            for layout_ph in layout.placeholders:
-                if layout_ph.placeholder_format.idx == ph_idx:
-                    layout_lst = layout_ph.text_frame._txBody.find(qn('a:lstStyle'))
-                    layout_result = _check_list_style_for_level(layout_lst, level)
-                    if layout_result is not None:
-                        return layout_result
-                    break
+            layout_result = _inherited_list_style_result(_LAYOUT_LST_CACHE, layout, ph_idx, level)
+            if layout_result is not None:
+                return layout_result
         except Exception:
             pass
         try:
             ph_idx = shape.placeholder_format.idx
             master = shape.part.slide_layout.slide_master
-            for master_ph in master.placeholders:
-                if master_ph.placeholder_format.idx == ph_idx:
-                    master_lst = master_ph.text_frame._txBody.find(qn('a:lstStyle'))
-                    master_result = _check_list_style_for_level(master_lst, level)
-                    if master_result is not None:
-                        return master_result
-                    break
+            master_result = _inherited_list_style_result(_MASTER_LST_CACHE, master, ph_idx, level)
+            if master_result is not None:
+                return master_result
         except Exception:
             pass
 
@@ -436,8 +635,13 @@ def get_paragraph_bullet_type(para, shape=None):
     if shape is not None and shape.is_placeholder:
         try:
             notes_master = shape.part.notes_master
-            notes_style = notes_master.element.find(qn('p:notesStyle'))
-            notes_result = _check_list_style_for_level(notes_style, level)
+            key = (id(notes_master), level)
+            if key in _NOTES_STYLE_CACHE:
+                notes_result = _NOTES_STYLE_CACHE[key]
+            else:
+                notes_style = notes_master.element.find(_QN_NOTESSTYLE)
+                notes_result = _check_list_style_for_level(notes_style, level)
+                _NOTES_STYLE_CACHE[key] = notes_result
             if notes_result is not None:
                 return notes_result
         except Exception:
@@ -450,13 +654,8 @@ def get_paragraph_bullet_type(para, shape=None):
     return 'none'
 
 
-def get_paragraph_number_start_at(para) -> int | None:
-    """读取段落 buAutoNum 的显式 startAt（若未显式设置则返回 None）。"""
-    pPr = para._p.find(qn('a:pPr'))
-    if pPr is None:
-        return None
-
-    bu_auto = pPr.find(qn('a:buAutoNum'))
+def _parse_bu_auto_start_at(bu_auto) -> int | None:
+    """解析 buAutoNum 元素上的显式 startAt 属性。"""
     if bu_auto is None:
         return None
 
@@ -471,6 +670,38 @@ def get_paragraph_number_start_at(para) -> int | None:
         return None
 
 
+def get_paragraph_number_start_at(para) -> int | None:
+    """读取段落 buAutoNum 的显式 startAt（若未显式设置则返回 None）。"""
+    pPr = para._p.find(_QN_PPR)
+    if pPr is None:
+        return None
+    return _parse_bu_auto_start_at(pPr.find(_QN_BUAUTO))
+
+
+def _paragraph_bullet_info(para, shape=None):
+    """一次性求段落的 (bullet_type, start_at)。
+
+    与先后调用 get_paragraph_bullet_type / get_paragraph_number_start_at 等价，
+    但 pPr 与 buAutoNum 各只 find 一次，列表密集的文本块里不必重复遍历。
+    """
+    pPr = para._p.find(_QN_PPR)
+    bullet_type = None
+    bu_auto = None
+    if pPr is not None:
+        if pPr.find(_QN_BUNONE) is not None:
+            bullet_type = 'none'
+        elif pPr.find(_QN_BUCHAR) is not None:
+            bullet_type = 'bullet'
+        else:
+            bu_auto = pPr.find(_QN_BUAUTO)
+            if bu_auto is not None:
+                bullet_type = 'numbered'
+    if bullet_type is None:
+        bullet_type = _inherited_bullet_type(para, shape)
+    start_at = _parse_bu_auto_start_at(bu_auto) if bullet_type == 'numbered' else None
+    return bullet_type, start_at
+
+
 def is_accent(font):
     if font.underline or font.italic or (
             font.color.type == MSO_COLOR_TYPE.SCHEME and
@@ -489,6 +720,13 @@ def is_strong(font):
 
 
 _NS_MATH = '{http://schemas.openxmlformats.org/officeDocument/2006/math}'
+_TAG_M_OMATH = f'{_NS_MATH}oMath'
+_TAG_M_OMATHPARA = f'{_NS_MATH}oMathPara'
+_TAG_M_T = f'{_NS_MATH}t'
+
+# dwml 的转换入口，首次用到时解析一次后缓存，
+# 公式密集的 deck 不必每段都走 import 机制
+_OMATH2LATEX = None
 
 
 def _omml_to_latex(a14m_element) -> Tuple[str, bool]:
@@ -500,23 +738,26 @@ def _omml_to_latex(a14m_element) -> Tuple[str, bool]:
 
     返回 (text, is_math)。is_math=True 时 text 为 LaTeX，否则为纯文本回退。
     """
-    from dwml.omml import oMath2Latex
+    global _OMATH2LATEX
+    if _OMATH2LATEX is None:
+        from dwml.omml import oMath2Latex
+        _OMATH2LATEX = oMath2Latex
 
-    omath = a14m_element.find(f'{_NS_MATH}oMath')
+    omath = a14m_element.find(_TAG_M_OMATH)
     if omath is None:
-        omathpara = a14m_element.find(f'{_NS_MATH}oMathPara')
+        omathpara = a14m_element.find(_TAG_M_OMATHPARA)
         if omathpara is not None:
-            omath = omathpara.find(f'{_NS_MATH}oMath')
+            omath = omathpara.find(_TAG_M_OMATH)
     if omath is None:
         return ('[公式]', False)
     try:
-        latex = str(oMath2Latex(omath)).strip()
+        latex = str(_OMATH2LATEX(omath)).strip()
         if latex:
             return (latex, True)
     except Exception as e:
         logger.warning(f'OMML→LaTeX 转换失败: {e}')
     # 回退：收集所有 m:t 文本
-    texts = [t.text for t in omath.iter(f'{_NS_MATH}t') if t.text]
+    texts = [t.text for t in omath.iter(_TAG_M_T) if t.text]
     if texts:
         return (''.join(texts), False)
     return ('[公式]', False)
@@ -527,8 +768,8 @@ def get_text_runs(para) -> List[TextRun]:
     r_index = 0
     pptx_runs = para.runs
     for child in para._p:
-        local_tag = child.tag.split('}')[-1]
-        if local_tag == 'r':
+        tag = child.tag
+        if tag == _QN_A_R:
             if r_index < len(pptx_runs):
                 run = pptx_runs[r_index]
                 r_index += 1
@@ -547,17 +788,25 @@ def get_text_runs(para) -> List[TextRun]:
                 if run.font.color.type == MSO_COLOR_TYPE.RGB:
                     result.style.color_rgb = run.font.color.rgb
                 runs.append(result)
-        elif local_tag == 'm':
+        elif tag.endswith('}m'):
             text, is_math = _omml_to_latex(child)
             if text:
                 runs.append(TextRun(text=text, style=TextStyle(is_math=is_math)))
     return runs
 
 
+# 自定义标题模糊匹配缓存：标题文本 -> extractOne 结果（False 表示无匹配）。
+# 同一份标题文本在分节页/页眉里反复出现，没必要每页都重新打分。
+_TITLE_MATCH_CACHE: dict = {}
+
+
 def process_title(config: ConversionConfig, shape, slide_idx) -> TitleElement:
     text = shape.text_frame.text.strip()
     if config.custom_titles:
-        res = fuze_process.extractOne(text, config.custom_titles.keys(), score_cutoff=92)
+        res = _TITLE_MATCH_CACHE.get(text)
+        if res is None:
+            res = fuze_process.extractOne(text, config.custom_titles.keys(), score_cutoff=92) or False
+            _TITLE_MATCH_CACHE[text] = res
         if not res:
             return TitleElement(content=text.strip(), level=max(config.custom_titles.values()) + 1)
         else:
@@ -598,19 +847,18 @@ def _indent_list_items_after_paragraph(elements):
 def process_text_blocks(config: ConversionConfig, shape, slide_idx) -> List[Union[ListItemElement, ParagraphElement]]:
     results = []
     for para in shape.text_frame.paragraphs:
-        has_text = para.text.strip() != ''
-        has_math = any(c.tag.split('}')[-1] == 'm' for c in para._p)
+        has_text, has_math = _para_has_content(para._p)
         if not has_text and not has_math:
             continue
         text = get_text_runs(para)
-        bullet_type = get_paragraph_bullet_type(para, shape)
+        bullet_type, start_at = _paragraph_bullet_info(para, shape)
         if bullet_type == 'numbered':
             results.append(
                 ListItemElement(
                     content=text,
                     level=para.level,
                     list_type=ListType.Ordered,
-                    list_number=get_paragraph_number_start_at(para),
+                    list_number=start_at,
                 )
             )
         elif bullet_type == 'bullet':
@@ -661,8 +909,7 @@ def _extract_notes_text(notes_slide) -> str:
     ordered_counters = {}
 
     for para in notes_frame.paragraphs:
-        has_text = para.text.strip() != ''
-        has_math = any(c.tag.split('}')[-1] == 'm' for c in para._p)
+        has_text, has_math = _para_has_content(para._p)
         if not has_text and not has_math:
             if lines and lines[-1] != '':
                 lines.append('')
@@ -705,7 +952,6 @@ def process_picture(config: ConversionConfig, shape, slide_idx) -> Union[ImageEl
     global picture_count
 
     file_prefix = ''.join(os.path.basename(config.pptx_path).split('.')[:-1])
-    pic_name = file_prefix + f'_{picture_count}'
     # python-pptx 的 shape.image.ext 依赖 PIL 识别格式；对于 WMF 等格式可能抛出 UnidentifiedImageError。
     # 这里优先从 image part 的 partname（例如 /ppt/media/image65.wmf）推断扩展名，兜底再用 shape.image.ext。
     img_blob = None
@@ -733,24 +979,44 @@ def process_picture(config: ConversionConfig, shape, slide_idx) -> Union[ImageEl
         # 最后的兜底：保持旧行为（可能仍会失败，但至少错误更明确）
         pic_ext = shape.image.ext
         img_blob = shape.image.blob
-    if not os.path.exists(config.image_dir):
-        os.makedirs(config.image_dir)
+
+    # 内容寻址：文件名取 blob 哈希前 12 位十六进制，既可复现又天然去重。
+    # 同一 blob 第二次出现时直接复用首次的转换结果（含 WMF 光栅化结果）。
+    blob_hash = hashlib.blake2b(img_blob, digest_size=16).digest()
+    cached = _IMAGE_HASH_INDEX.get(blob_hash)
+    if cached is not None:
+        cached_path, cached_original_ext = cached
+        return ImageElement(path=cached_path, width=config.image_width, original_ext=cached_original_ext)
+
+    def _register(outputter_path, original_ext=''):
+        _IMAGE_HASH_INDEX[blob_hash] = (outputter_path, original_ext)
+        return ImageElement(path=outputter_path, width=config.image_width, original_ext=original_ext)
+
+    pic_name = file_prefix + f'_{blob_hash.hex()[:12]}'
+    ctx_key = (str(config.output_path), str(config.image_dir))
+    common_path = _IMAGE_PATH_CONTEXT.get(ctx_key)
+    if common_path is None:
+        os.makedirs(config.image_dir, exist_ok=True)
+        common_path = os.path.commonpath([config.output_path, config.image_dir])
+        _IMAGE_PATH_CONTEXT[ctx_key] = common_path
 
     output_path = config.image_dir / f'{pic_name}.{pic_ext}'
-    common_path = os.path.commonpath([config.output_path, config.image_dir])
     img_outputter_path = os.path.relpath(output_path, common_path)
     with open(output_path, 'wb') as f:
         f.write(img_blob)
         picture_count += 1
+    # 高分辨率图片的 blob 可能有几十 MB，写盘后立即释放本地引用，
+    # 不要让它在后面的 WMF 转换管线期间一直占着内存
+    del img_blob
 
     # 普通图片
     if pic_ext != 'wmf':
-        return ImageElement(path=img_outputter_path, width=config.image_width)
+        return _register(img_outputter_path)
 
     # WMF 图片：如果 disable_wmf 为 True，则保留原始 WMF 不转换
     if config.disable_wmf:
         logger.info(f'WMF image {output_path} in slide {slide_idx} kept as-is (disable_wmf=True).')
-        return ImageElement(path=img_outputter_path, width=config.image_width, original_ext='wmf')
+        return _register(img_outputter_path, original_ext='wmf')
 
     # WMF 图片：尝试转换为光栅图（PNG/JPG），失败则输出原始格式
     raster_ext = _env_str("PPTX2MD_WMF_RASTER_EXT", "png").lower()
@@ -763,36 +1029,39 @@ def process_picture(config: ConversionConfig, shape, slide_idx) -> Union[ImageEl
 
     try:
         try:
-            Image.open(output_path).save(raster_output_path)
-            return ImageElement(path=raster_outputter_path, width=config.image_width)
+            # 上下文管理确保 Pillow 及时关闭源文件、释放解码器缓冲
+            with Image.open(output_path) as im:
+                im.save(raster_output_path)
+            return _register(raster_outputter_path)
         except Exception:  # Pillow 转换失败，尝试 wand(ImageMagick) / magick CLI / PowerPoint COM
             # 1) wand（依赖 ImageMagick 且支持 WMF）
-            try:
-                from wand.image import Image as WandImage  # type: ignore
+            WandImage = _get_wand_image_class()
+            if WandImage:
                 try:
-                    with WandImage(filename=str(output_path), resolution=dpi) as img:
-                        img.format = raster_ext
-                        if raster_ext in ("jpg", "jpeg"):
-                            img.compression_quality = jpg_quality
-                        img.save(filename=raster_output_path)
-                    logger.info(f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via wand.')
-                    return ImageElement(path=raster_outputter_path, width=config.image_width)
-                except TypeError:
-                    # 某些 wand 版本不支持 resolution 参数
-                    with WandImage(filename=str(output_path)) as img:
-                        img.format = raster_ext
-                        if raster_ext in ("jpg", "jpeg"):
-                            img.compression_quality = jpg_quality
-                        img.save(filename=raster_output_path)
-                    logger.info(f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via wand.')
-                    return ImageElement(path=raster_outputter_path, width=config.image_width)
-            except Exception:
-                pass
+                    try:
+                        with WandImage(filename=str(output_path), resolution=dpi) as img:
+                            img.format = raster_ext
+                            if raster_ext in ("jpg", "jpeg"):
+                                img.compression_quality = jpg_quality
+                            img.save(filename=raster_output_path)
+                        logger.info(f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via wand.')
+                        return _register(raster_outputter_path)
+                    except TypeError:
+                        # 某些 wand 版本不支持 resolution 参数
+                        with WandImage(filename=str(output_path)) as img:
+                            img.format = raster_ext
+                            if raster_ext in ("jpg", "jpeg"):
+                                img.compression_quality = jpg_quality
+                            img.save(filename=raster_output_path)
+                        logger.info(f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via wand.')
+                        return _register(raster_outputter_path)
+                except Exception:
+                    pass
 
             # 2) ImageMagick CLI（magick）
             if _convert_wmf_via_magick(str(output_path), raster_output_path, dpi=dpi, jpg_quality=jpg_quality):
                 logger.info(f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via magick.')
-                return ImageElement(path=raster_outputter_path, width=config.image_width)
+                return _register(raster_outputter_path)
 
             # 3) PowerPoint COM：整页导出后按 shape 边界裁剪（高清、最稳）
             if _should_try_wmf_com_fallback():
@@ -806,7 +1075,7 @@ def process_picture(config: ConversionConfig, shape, slide_idx) -> Union[ImageEl
                         logger.info(
                             f'WMF image {output_path} in slide {slide_idx} converted to {raster_ext} via PowerPoint COM.'
                         )
-                        return ImageElement(path=raster_outputter_path, width=config.image_width)
+                        return _register(raster_outputter_path)
                 except Exception:
                     pass
     except Exception:
@@ -816,14 +1085,16 @@ def process_picture(config: ConversionConfig, shape, slide_idx) -> Union[ImageEl
         logger.warning(
             f'Cannot convert wmf image {output_path} in slide {slide_idx} to {raster_ext}, keeping original wmf.'
         )
-        return ImageElement(path=img_outputter_path, width=config.image_width, original_ext='wmf')
+        return _register(img_outputter_path, original_ext='wmf')
     except Exception:
-        return ImageElement(path=img_outputter_path, width=config.image_width, original_ext='wmf')
+        return _register(img_outputter_path, original_ext='wmf')
 
 
 def process_table(config: ConversionConfig, shape, slide_idx) -> Union[TableElement, None]:
-    table = [[sum([get_text_runs(p)
-                   for p in cell.text_frame.paragraphs], [])
+    # 单层推导式展开 runs；sum(lists, []) 每加一段都要重建列表，宽表上是 O(n²)
+    table = [[[run
+               for p in cell.text_frame.paragraphs
+               for run in get_text_runs(p)]
               for cell in row.cells]
              for row in shape.table.rows]
     if len(table) > 0:
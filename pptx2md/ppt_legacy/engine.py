@@ -7,11 +7,14 @@
 """
 
 import os
+import statistics
 import sys
 import time
 import traceback
 import re
 
+import numpy as np
+
 from pptx2md.powerpoint_com import (
     build_powerpoint_com_repair_message,
     get_registered_powerpoint_com_info,
@@ -30,12 +33,12 @@ from pptx2md.ppt_legacy.renderer_markdown import (
 from pptx2md.ppt_legacy.extractor_core import (
     build_image_extract_context_core as _build_image_extract_context_core,
     build_image_placeholder_markdown_core as _build_image_placeholder_markdown_core,
+    build_shape_id_index_core as _build_shape_id_index_core,
     build_title_render_context_core as _build_title_render_context_core,
     detect_slide_title_core as _detect_slide_title_core,
     escape_md_table_cell_core as _escape_md_table_cell_core,
     escape_md_text_line_core as _escape_md_text_line_core,
     extract_title_shape_extra_lines_core as _extract_title_shape_extra_lines_core,
-    find_shape_by_id_in_slide_core as _find_shape_by_id_in_slide_core,
     first_paragraph_text_core as _first_paragraph_text_core,
     extract_text_from_shape_core as _extract_text_from_shape_core,
     export_shape_image_markdown_core as _export_shape_image_markdown_core,
@@ -150,32 +153,77 @@ def _is_title_candidate_shape(shape):
     )
 
 
+# detect_slide_title 的单槽结果缓存：标题检测要扫描全部 shape 并读字号（COM），
+# 同一 slide 的重复调用直接复用结果（同一时刻只处理一个 slide，见模块头说明）。
+_slide_title_slide = None
+_slide_title_info = None
+
+
+def _reset_slide_title_cache():
+    global _slide_title_slide, _slide_title_info
+    _slide_title_slide = None
+    _slide_title_info = None
+
+
 def detect_slide_title(slide):
     """识别单页幻灯片的第一行标题。
 
     优先使用 slide.Shapes.Title；否则从文本shape中按"靠上 + 字号大 + 文本短"择优。
+    同一 slide 对象的重复调用命中缓存，不再重新扫描。
     返回：
         {
           "title": str|None,
           "shape_id": int|None,   # 标题所在shape id（用于正文中跳过重复输出）
         }
     """
-    return _detect_slide_title_core(
+    global _slide_title_slide, _slide_title_info
+    if _slide_title_slide is slide:
+        return _slide_title_info
+
+    info = _detect_slide_title_core(
         slide,
         safe_shape_id_fn=_safe_shape_id,
         first_paragraph_text_fn=_first_paragraph_text,
         is_title_candidate_shape_fn=_is_title_candidate_shape,
     )
+    _slide_title_slide = slide
+    _slide_title_info = info
+    return info
+
+
+# _find_shape_by_id_in_slide 的单槽索引缓存：同一进程同一时刻只处理一个 slide
+# （见模块头线程安全说明），处理下一个 slide 时自动重建。
+_shape_index_slide = None
+_shape_index = {}
+
+
+def _reset_shape_index_cache():
+    global _shape_index_slide, _shape_index
+    _shape_index_slide = None
+    _shape_index = {}
 
 
 def _find_shape_by_id_in_slide(slide, shape_id):
-    """在 slide.Shapes 中按 shape.Id 查找 Shape（失败则返回 None）。"""
-    return _find_shape_by_id_in_slide_core(
-        slide,
-        shape_id,
-        safe_shape_id_fn=_safe_shape_id,
-        debug_exc_fn=_debug_exc,
-    )
+    """在 slide.Shapes 中按 shape.Id 查找 Shape（失败则返回 None）。
+
+    首次查找时枚举一次 Shapes 建立 {id: shape} 索引，后续查找为 O(1)。
+    """
+    global _shape_index_slide, _shape_index
+    if shape_id is None:
+        return None
+    try:
+        target = int(shape_id)
+    except Exception:
+        return None
+
+    if _shape_index_slide is not slide:
+        _shape_index = _build_shape_id_index_core(
+            slide,
+            safe_shape_id_fn=_safe_shape_id,
+            debug_exc_fn=_debug_exc,
+        )
+        _shape_index_slide = slide
+    return _shape_index.get(target)
 
 
 def _extract_title_shape_extra_lines(slide, title_info):
@@ -196,9 +244,13 @@ def _extract_title_shape_extra_lines(slide, title_info):
     )
 
 
+# 异常消息里的换行统一压成空格（translate 一次扫描，避免两趟 replace 分配）
+_CTRL_SPACE_TABLE = str.maketrans({"\r": " ", "\n": " "})
+
+
 def _format_exc(e, limit=120):
     msg = str(e) if e is not None else ""
-    msg = msg.replace("\r", " ").replace("\n", " ")
+    msg = msg.translate(_CTRL_SPACE_TABLE)
     if len(msg) > limit:
         msg = msg[:limit] + "..."
     return f"{type(e).__name__}: {msg}" if msg else type(e).__name__
@@ -218,20 +270,24 @@ def _debug_exc(context, e):
 
 
 def _wait_com(action, timeout_sec, context, cancel_event=None):
-    """轮询等待COM调用成功；支持取消；超时则抛出最后一次异常。"""
-    deadline = time.time() + timeout_sec
-    start = time.time()
+    """轮询等待COM调用成功；支持取消；超时则抛出最后一次异常。
+
+    使用单调时钟（不受系统时间调整影响），每轮循环只读一次时钟。
+    """
+    start = time.monotonic()
+    deadline = start + timeout_sec
     attempts = 0
     last_exc = None
     first_exc = None
-    while time.time() <= deadline:
+    now = start
+    while now <= deadline:
         if cancel_event and cancel_event.is_set():
             raise ConversionCancelled()
         attempts += 1
         try:
             result = action()
             if DEBUG and attempts > 1:
-                elapsed = time.time() - start
+                elapsed = time.monotonic() - start
                 _debug(f"{context}: 成功(重试{attempts - 1}次, {elapsed:.2f}s)")
             return result
         except ConversionCancelled:
@@ -239,9 +295,12 @@ def _wait_com(action, timeout_sec, context, cancel_event=None):
         except Exception as e:
             if first_exc is None:
                 first_exc = e
-                _debug(f"{context}: 首次失败: {_format_exc(e)}")
+                if DEBUG:
+                    # 非 DEBUG 时连消息字符串都不构建（轮询热路径）
+                    _debug(f"{context}: 首次失败: {_format_exc(e)}")
             last_exc = e
             time.sleep(COM_POLL_INTERVAL_SEC)
+        now = time.monotonic()
     if last_exc is not None:
         _debug_exc(f"{context}: 超时({timeout_sec}s, 尝试{attempts}次)", last_exc)
         raise last_exc
@@ -397,7 +456,77 @@ def sort_shapes_by_visual_position(shapes, row_threshold_points="auto",
     return [s for row in rows for s in row]
 
 
-def _compute_adaptive_row_threshold(shapes):
+def _snapshot_shape(shape):
+    """一次性读取 shape 的常用 COM 属性，返回快照字典。
+
+    版式分析（锚点/行分组/XY-Cut/自适应阈值）会反复用到同一批属性，
+    而每次属性访问都是一次 COM/IDispatch 往返（这是提取的主要耗时来源）。
+    这里在入口处把它们读齐，后续流程只查字典，不再触碰 COM 对象。
+
+    Returns:
+        dict，键：
+        - shape: 原始 COM 对象（供下游渲染使用）
+        - id: shape.Id（int 或 None）
+        - type: shape.Type（int 或 None）
+        - has_table: bool
+        - left/top/width/height: 外框几何（float 或 None，读取失败时）
+        - has_text: bool
+        - bound_left/bound_top/bound_width/bound_height: 文本包围盒（float 或 None）
+    """
+    snap = {
+        "shape": shape,
+        "id": _safe_shape_id(shape),
+        "type": None,
+        "has_table": False,
+        "left": None,
+        "top": None,
+        "width": None,
+        "height": None,
+        "has_text": False,
+        "bound_left": None,
+        "bound_top": None,
+        "bound_width": None,
+        "bound_height": None,
+    }
+
+    try:
+        snap["type"] = int(shape.Type)
+    except Exception:
+        pass
+
+    try:
+        snap["has_table"] = bool(shape.HasTable)
+    except Exception:
+        pass
+
+    try:
+        snap["left"] = float(shape.Left)
+        snap["top"] = float(shape.Top)
+        snap["width"] = float(shape.Width)
+        snap["height"] = float(shape.Height)
+    except Exception as e:
+        _debug_exc("_snapshot_shape: 读取Shape.Left/Top/Width/Height失败", e)
+
+    try:
+        if shape.HasTextFrame and shape.TextFrame.HasText:
+            snap["has_text"] = True
+            tr = shape.TextFrame.TextRange
+            snap["bound_left"] = float(tr.BoundLeft)
+            snap["bound_top"] = float(tr.BoundTop)
+            snap["bound_width"] = float(tr.BoundWidth)
+            snap["bound_height"] = float(tr.BoundHeight)
+    except Exception as e:
+        _debug_exc("_snapshot_shape: 读取TextRange.Bound*失败", e)
+
+    return snap
+
+
+def _build_snapshot_cache(shapes_list):
+    """为 shapes 建立 {id(shape): snapshot} 缓存（每个 shape 只读一次 COM）。"""
+    return {id(s): _snapshot_shape(s) for s in shapes_list}
+
+
+def _compute_adaptive_row_threshold(shapes, snapshot_cache=None):
     """根据 shapes 的文本高度动态计算行判定阈值。
 
     策略：收集所有文本框的实际文本高度，取中位数的 1.3 倍作为阈值。
@@ -405,30 +534,29 @@ def _compute_adaptive_row_threshold(shapes):
 
     Args:
         shapes: 形状集合
+        snapshot_cache: {id(shape): snapshot}，若为空则现场构建
 
     Returns:
         float: 计算出的阈值（磅），若无法计算则返回 ROW_THRESHOLD_FALLBACK
     """
+    if snapshot_cache is None:
+        snapshot_cache = _build_snapshot_cache(list(shapes))
+
     heights = []
     for shape in shapes:
-        try:
-            if not shape.HasTextFrame:
-                continue
-            if not shape.TextFrame.HasText:
-                continue
-            tr = shape.TextFrame.TextRange
-            bound_height = float(tr.BoundHeight)
-            if bound_height > 0:
-                heights.append(bound_height)
-        except Exception:
-            pass
+        snap = snapshot_cache.get(id(shape))
+        if snap is None or not snap["has_text"]:
+            continue
+        bound_height = snap["bound_height"]
+        if bound_height is not None and bound_height > 0:
+            heights.append(bound_height)
 
     if not heights:
         return ROW_THRESHOLD_FALLBACK
 
-    # 使用中位数，对异常值更鲁棒
-    heights.sort()
-    median_height = heights[len(heights) // 2]
+    # 使用中位数，对异常值更鲁棒（median_high 与旧实现 heights[len//2] 取值一致，
+    # 且无需为单个次序统计量手工排序整个列表）
+    median_height = statistics.median_high(heights)
 
     # 阈值 = 中位数高度 × 1.3（经验系数，允许轻微错位）
     threshold = median_height * 1.3
@@ -443,38 +571,36 @@ def _compute_adaptive_row_threshold(shapes):
     return threshold
 
 
-def _shape_anchor_xy(shape):
-    """返回用于视觉排序的锚点坐标(x, y)（单位：磅）。
+def _snapshot_anchor_xy(snap):
+    """从快照计算视觉排序锚点坐标(x, y)（单位：磅）。
 
     经验上，Shape.Top/Left 是外框；对于不同字号/不同内边距的文本框，
     仅用Top会把"看起来同一行"的内容拆成两行。
 
     这里尽量使用TextRange的Bound*（文本实际包围盒）来估计锚点。
     """
-    try:
-        # 默认回退到形状外框中心
-        x = float(shape.Left) + float(shape.Width) / 2.0
-        y = float(shape.Top) + float(shape.Height) / 2.0
-    except Exception as e:
-        _debug_exc("_shape_anchor_xy: 读取Shape.Left/Top/Width/Height失败", e)
+    left = snap["left"]
+    if left is None:
         return float("inf"), float("inf")
+    top = snap["top"]
 
-    try:
-        if shape.HasTextFrame and shape.TextFrame.HasText:
-            tr = shape.TextFrame.TextRange
-            # Bound* 是文本实际包围盒相对TextFrame的位置（实践中一般可加上shape.Top/Left）
-            bx = float(shape.Left) + float(tr.BoundLeft) + float(tr.BoundWidth) / 2.0
-            by = float(shape.Top) + float(tr.BoundTop) + float(tr.BoundHeight) / 2.0
-            # 只要能读到Bound*，就用它（比外框更接近视觉位置）
-            x, y = bx, by
-    except Exception as e:
-        _debug_exc("_shape_anchor_xy: 读取TextRange.Bound*失败，回退到外框中心", e)
+    if snap["has_text"] and snap["bound_left"] is not None:
+        # Bound* 是文本实际包围盒相对TextFrame的位置（实践中一般可加上shape.Top/Left）
+        # 只要能读到Bound*，就用它（比外框更接近视觉位置），不再计算外框中心
+        return (left + snap["bound_left"] + snap["bound_width"] / 2.0,
+                top + snap["bound_top"] + snap["bound_height"] / 2.0)
 
-    return x, y
+    # 回退到形状外框中心
+    return left + snap["width"] / 2.0, top + snap["height"] / 2.0
 
 
-def _shape_bbox(shape):
-    """返回 shape 的边界框 (left, top, right, bottom)，单位：磅
+def _shape_anchor_xy(shape):
+    """返回用于视觉排序的锚点坐标(x, y)（单位：磅）。兼容封装，直接读 COM。"""
+    return _snapshot_anchor_xy(_snapshot_shape(shape))
+
+
+def _snapshot_bbox(snap):
+    """从快照计算 shape 的边界框 (left, top, right, bottom)，单位：磅
 
     策略：
     - 优先使用 TextRange.Bound*（文本实际包围盒）
@@ -482,158 +608,134 @@ def _shape_bbox(shape):
     - 回退到 shape 外框
     - 返回 None 表示读取失败
     """
-    # 1. 读取 shape 外框
-    try:
-        left = float(shape.Left)
-        top = float(shape.Top)
-        right = left + float(shape.Width)
-        bottom = top + float(shape.Height)
-    except Exception:
+    # 1. 外框
+    left = snap["left"]
+    if left is None:
         return None
+    top = snap["top"]
+    right = left + snap["width"]
+    bottom = top + snap["height"]
 
     # 2. 尝试使用文本包围盒
-    try:
-        if shape.HasTextFrame and shape.TextFrame.HasText:
-            tr = shape.TextFrame.TextRange
-            bw = float(tr.BoundWidth)
-            bh = float(tr.BoundHeight)
-
-            if bw > 0 and bh > 0:
-                text_left = left + float(tr.BoundLeft)
-                text_top = top + float(tr.BoundTop)
-                text_right = text_left + bw
-                text_bottom = text_top + bh
-
-                # Clamp 到 shape 外框
-                text_left = max(text_left, left)
-                text_top = max(text_top, top)
-                text_right = min(text_right, right)
-                text_bottom = min(text_bottom, bottom)
-
-                if text_right > text_left and text_bottom > text_top:
-                    return (text_left, text_top, text_right, text_bottom)
-    except Exception:
-        pass
+    if snap["has_text"] and snap["bound_width"] is not None:
+        bw = snap["bound_width"]
+        bh = snap["bound_height"]
 
-    return (left, top, right, bottom)
+        if bw > 0 and bh > 0:
+            text_left = left + snap["bound_left"]
+            text_top = top + snap["bound_top"]
+            text_right = text_left + bw
+            text_bottom = text_top + bh
 
+            # Clamp 到 shape 外框
+            text_left = max(text_left, left)
+            text_top = max(text_top, top)
+            text_right = min(text_right, right)
+            text_bottom = min(text_bottom, bottom)
 
-def _is_wide_shape(bbox, region_bbox):
-    """宽度跨区桥接：用于垂直切割时忽略标题/页眉/页脚等"满宽"元素。"""
-    bw = bbox[2] - bbox[0]
-    rw = region_bbox[2] - region_bbox[0]
-    return rw > 0 and (bw / rw) >= WIDE_SPAN_RATIO
+            if text_right > text_left and text_bottom > text_top:
+                return (text_left, text_top, text_right, text_bottom)
 
+    return (left, top, right, bottom)
 
-def _is_tall_shape(bbox, region_bbox):
-    """高度跨区桥接：用于水平切割时忽略少量"满高"元素（如侧边装饰条）。"""
-    bh = bbox[3] - bbox[1]
-    rh = region_bbox[3] - region_bbox[1]
-    return rh > 0 and (bh / rh) >= TALL_SPAN_RATIO
 
+def _shape_bbox(shape):
+    """返回 shape 的边界框 (left, top, right, bottom)。兼容封装，直接读 COM。"""
+    return _snapshot_bbox(_snapshot_shape(shape))
 
-def _find_vertical_cut(boxes, region_bbox):
-    """寻找有效的垂直切割点
+
+def _find_axis_cut(bbox_arr, lo, hi, span_ratio, gap_ratio, min_gap_points, axis):
+    """在指定轴上寻找有效切割点（向量化实现，垂直/水平共用）。
 
     Args:
-        boxes: [(shape, bbox), ...] 候选 shapes 及其 bbox
-        region_bbox: 当前区域边界框
+        bbox_arr: np.ndarray (N, 4) bbox 数组（left, top, right, bottom）
+        lo, hi: 当前区域在该轴上的起止坐标
+        span_ratio: 跨区桥接判定比例（满宽/满高元素被忽略）
+        gap_ratio: 间隙阈值比例
+        min_gap_points: 间隙阈值下限（磅）
+        axis: 0=垂直切割（按 left/right），1=水平切割（按 top/bottom）
 
     Returns:
-        cut_x: 切割点 x 坐标，若无有效切割则返回 None
+        cut: 切割点坐标，若无有效切割则返回 None
     """
-    # 1. 过滤跨栏桥接 shape
-    narrow_boxes = [(s, b) for s, b in boxes if not _is_wide_shape(b, region_bbox)]
+    region_span = hi - lo
+
+    # 1. 过滤跨区桥接 shape（满宽标题带/满高装饰条等）
+    spans = bbox_arr[:, axis + 2] - bbox_arr[:, axis]
+    if region_span > 0:
+        candidates = bbox_arr[spans < region_span * span_ratio]
+    else:
+        candidates = bbox_arr
 
-    if len(narrow_boxes) < 2:
+    if candidates.shape[0] < 2:
         return None
 
     # 2. 计算阈值
-    region_width = region_bbox[2] - region_bbox[0]
-    gap_threshold = max(region_width * VERTICAL_GAP_RATIO, MIN_V_GAP_POINTS)
-
-    # 3. 合并区间方式寻找最大间隙
-    sorted_boxes = sorted(narrow_boxes, key=lambda x: x[1][0])
-
-    max_gap = 0
-    best_cut = None
-    right_edge = sorted_boxes[0][1][2]
+    gap_threshold = max(region_span * gap_ratio, min_gap_points)
 
-    for i in range(1, len(sorted_boxes)):
-        current_left = sorted_boxes[i][1][0]
-        gap = current_left - right_edge
+    # 3. 合并区间方式寻找最大间隙：排序后对运行最大右边缘做一次向量化差分
+    order = np.argsort(candidates[:, axis], kind="stable")
+    starts = candidates[order, axis]
+    running_edge = np.maximum.accumulate(candidates[order, axis + 2])
+    gaps = starts[1:] - running_edge[:-1]
 
-        if gap > max_gap and gap >= gap_threshold:
-            max_gap = gap
-            best_cut = (right_edge + current_left) / 2.0
-
-        right_edge = max(right_edge, sorted_boxes[i][1][2])
-
-    if best_cut is None:
+    valid = np.nonzero(gaps >= gap_threshold)[0]
+    if valid.size == 0:
         return None
+    best_i = valid[np.argmax(gaps[valid])]
+    best_cut = (running_edge[best_i] + starts[best_i + 1]) / 2.0
 
     # 4. 校验无跨越
-    for shape, bbox in narrow_boxes:
-        if bbox[0] < best_cut - XY_CUT_EPS and best_cut + XY_CUT_EPS < bbox[2]:
-            return None
-
-    # 5. 校验两侧数量
-    left_count = sum(1 for _, b in narrow_boxes if b[2] <= best_cut + XY_CUT_EPS)
-    right_count = sum(1 for _, b in narrow_boxes if b[0] >= best_cut - XY_CUT_EPS)
-
-    if left_count < MIN_SHAPES_PER_REGION or right_count < MIN_SHAPES_PER_REGION:
+    if np.any((candidates[:, axis] < best_cut - XY_CUT_EPS) &
+              (best_cut + XY_CUT_EPS < candidates[:, axis + 2])):
         return None
 
-    return best_cut
-
-
-def _find_horizontal_cut(boxes, region_bbox):
-    """寻找有效的水平切割点（用于"标题带 + 两栏正文"的第一刀）
-
-    思路与 _find_vertical_cut 对称：按 top 排序，寻找最大垂直间隙。
-    """
-    # 1. 过滤跨行桥接 shape（满高装饰条等）
-    short_boxes = [(s, b) for s, b in boxes if not _is_tall_shape(b, region_bbox)]
-    if len(short_boxes) < 2:
+    # 5. 校验两侧数量
+    first_count = int(np.sum(candidates[:, axis + 2] <= best_cut + XY_CUT_EPS))
+    second_count = int(np.sum(candidates[:, axis] >= best_cut - XY_CUT_EPS))
+    if first_count < MIN_SHAPES_PER_REGION or second_count < MIN_SHAPES_PER_REGION:
         return None
 
-    # 2. 计算阈值
-    region_height = region_bbox[3] - region_bbox[1]
-    gap_threshold = max(region_height * HORIZONTAL_GAP_RATIO, MIN_H_GAP_POINTS)
+    return float(best_cut)
 
-    # 3. 合并区间方式寻找最大间隙（按 top）
-    sorted_boxes = sorted(short_boxes, key=lambda x: x[1][1])
 
-    max_gap = 0
-    best_cut = None
-    bottom_edge = sorted_boxes[0][1][3]
+def _find_vertical_cut(bbox_arr, region_bbox):
+    """寻找有效的垂直切割点
 
-    for i in range(1, len(sorted_boxes)):
-        current_top = sorted_boxes[i][1][1]
-        gap = current_top - bottom_edge
-        if gap > max_gap and gap >= gap_threshold:
-            max_gap = gap
-            best_cut = (bottom_edge + current_top) / 2.0
-        bottom_edge = max(bottom_edge, sorted_boxes[i][1][3])
+    Args:
+        bbox_arr: np.ndarray (N, 4) 候选 bbox 数组
+        region_bbox: 当前区域边界框
 
-    if best_cut is None:
-        return None
+    Returns:
+        cut_x: 切割点 x 坐标，若无有效切割则返回 None
+    """
+    return _find_axis_cut(
+        bbox_arr,
+        region_bbox[0], region_bbox[2],
+        span_ratio=WIDE_SPAN_RATIO,
+        gap_ratio=VERTICAL_GAP_RATIO,
+        min_gap_points=MIN_V_GAP_POINTS,
+        axis=0,
+    )
 
-    # 4. 校验无跨越
-    for _, bbox in short_boxes:
-        if bbox[1] < best_cut - XY_CUT_EPS and best_cut + XY_CUT_EPS < bbox[3]:
-            return None
 
-    # 5. 校验两侧数量
-    top_count = sum(1 for _, b in short_boxes if b[3] <= best_cut + XY_CUT_EPS)
-    bottom_count = sum(1 for _, b in short_boxes if b[1] >= best_cut - XY_CUT_EPS)
-    if top_count < MIN_SHAPES_PER_REGION or bottom_count < MIN_SHAPES_PER_REGION:
-        return None
+def _find_horizontal_cut(bbox_arr, region_bbox):
+    """寻找有效的水平切割点（用于"标题带 + 两栏正文"的第一刀）
 
-    return best_cut
+    思路与 _find_vertical_cut 对称：按 top 排序，寻找最大垂直间隙。
+    """
+    return _find_axis_cut(
+        bbox_arr,
+        region_bbox[1], region_bbox[3],
+        span_ratio=TALL_SPAN_RATIO,
+        gap_ratio=HORIZONTAL_GAP_RATIO,
+        min_gap_points=MIN_H_GAP_POINTS,
+        axis=1,
+    )
 
 
-def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_points):
+def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_points,
+                      snapshot_cache=None):
     """递归 XY-Cut 分区
 
     Args:
@@ -642,6 +744,7 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
         depth: 当前递归深度
         bbox_cache: {id(shape): bbox} 缓存
         row_threshold_points: 行阈值参数
+        snapshot_cache: {id(shape): snapshot} 缓存（供行分组回退复用）
 
     Returns:
         List[List[shape]]: 按阅读顺序排列的区域列表（每个区域是 shape 列表）
@@ -653,7 +756,7 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
         if bbox is None:
             # 不允许静默丢 shape：只要该区域出现无法读 bbox 的元素，就回退到旧算法
             fallback_rows = _group_shapes_by_visual_rows_simple(
-                list(shapes), row_threshold_points
+                list(shapes), row_threshold_points, snapshot_cache=snapshot_cache
             )
             return [[s for row in fallback_rows for s in row]]
         boxes.append((shape, bbox))
@@ -663,12 +766,41 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
     if len(boxes) == 1:
         return [[boxes[0][0]]]
 
-    # 达到最大深度
-    if depth >= XY_CUT_MAX_DEPTH:
+    # 数值层递归：只操作 bbox 数组与索引，最后一次性映射回 shape 对象
+    bbox_arr = np.asarray([b for _, b in boxes], dtype=np.float64)
+    region_groups = _xy_cut_region_indices(
+        bbox_arr, np.arange(len(boxes), dtype=np.intp), region_bbox, depth
+    )
+
+    result = []
+    for indices in region_groups:
+        region_shapes = [boxes[i][0] for i in indices]
         sorted_rows = _group_shapes_by_visual_rows_simple(
-            [s for s, _ in boxes], row_threshold_points
+            region_shapes, row_threshold_points, snapshot_cache=snapshot_cache
         )
-        return [[s for row in sorted_rows for s in row]]
+        result.append([s for row in sorted_rows for s in row])
+    return result
+
+
+def _xy_cut_region_indices(bbox_arr, indices, region_bbox, depth):
+    """XY-Cut 的纯数值递归层：对索引数组切割，返回按阅读顺序排列的索引组。
+
+    不接触 COM 对象与 shape 列表，每层只做数组切片/布尔掩码，
+    避免递归过程中反复重建 Python 元组列表。
+
+    Args:
+        bbox_arr: np.ndarray (N, 4) 全量 bbox 数组
+        indices: np.ndarray 当前区域内 shape 在 bbox_arr 中的索引
+        region_bbox: 当前区域边界框 (left, top, right, bottom)
+        depth: 当前递归深度
+
+    Returns:
+        List[np.ndarray]: 每个元素是一个区域的索引数组
+    """
+    if indices.size <= 1 or depth >= XY_CUT_MAX_DEPTH:
+        return [indices]
+
+    sub = bbox_arr[indices]
 
     # 决定切割方向
     region_width = region_bbox[2] - region_bbox[0]
@@ -676,14 +808,17 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
     # 经验规则：
     # - 顶层若存在"满宽且靠上"的元素，更可能是"标题带 + 正文"，优先水平切
     # - 否则按长宽比决定（宽页优先垂直切，减少双栏被水平误切的概率）
-    has_top_wide = any(
-        _is_wide_shape(b, region_bbox) and (b[1] - region_bbox[1]) <= region_height * 0.25
-        for _, b in boxes
-    )
+    if region_width > 0:
+        has_top_wide = bool(np.any(
+            ((sub[:, 2] - sub[:, 0]) >= region_width * WIDE_SPAN_RATIO) &
+            ((sub[:, 1] - region_bbox[1]) <= region_height * 0.25)
+        ))
+    else:
+        has_top_wide = False
     prefer_vertical = (not has_top_wide) and (region_width > region_height * 1.5)
 
-    h_cut = _find_horizontal_cut(boxes, region_bbox)
-    v_cut = _find_vertical_cut(boxes, region_bbox)
+    h_cut = _find_horizontal_cut(sub, region_bbox)
+    v_cut = _find_vertical_cut(sub, region_bbox)
 
     chosen_cut = None
     is_horizontal = False
@@ -701,25 +836,14 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
 
     # 无法切割
     if chosen_cut is None:
-        sorted_rows = _group_shapes_by_visual_rows_simple(
-            [s for s, _ in boxes], row_threshold_points
-        )
-        return [[s for row in sorted_rows for s in row]]
+        return [indices]
 
     # 按中心点分配
-    first_shapes = []
-    second_shapes = []
-
-    for s, b in boxes:
-        if is_horizontal:
-            center = (b[1] + b[3]) / 2.0
-        else:
-            center = (b[0] + b[2]) / 2.0
-
-        if center < chosen_cut:
-            first_shapes.append(s)
-        else:
-            second_shapes.append(s)
+    if is_horizontal:
+        centers = (sub[:, 1] + sub[:, 3]) / 2.0
+    else:
+        centers = (sub[:, 0] + sub[:, 2]) / 2.0
+    first_mask = centers < chosen_cut
 
     # 计算子区域 bbox
     if is_horizontal:
@@ -730,13 +854,8 @@ def _xy_cut_partition(shapes, region_bbox, depth, bbox_cache, row_threshold_poin
         second_bbox = (chosen_cut, region_bbox[1], region_bbox[2], region_bbox[3])
 
     # 递归
-    result = []
-    result.extend(_xy_cut_partition(first_shapes, first_bbox, depth + 1,
-                                    bbox_cache, row_threshold_points))
-    result.extend(_xy_cut_partition(second_shapes, second_bbox, depth + 1,
-                                    bbox_cache, row_threshold_points))
-
-    return result
+    return (_xy_cut_region_indices(bbox_arr, indices[first_mask], first_bbox, depth + 1) +
+            _xy_cut_region_indices(bbox_arr, indices[~first_mask], second_bbox, depth + 1))
 
 
 def _compute_region_bbox_from_cache(shapes, cache):
@@ -758,7 +877,8 @@ def _compute_region_bbox_from_cache(shapes, cache):
     return (min(lefts), min(tops), max(rights), max(bottoms))
 
 
-def _xy_cut_regions_to_rows(regions, row_threshold_points, slide_size=None):
+def _xy_cut_regions_to_rows(regions, row_threshold_points, slide_size=None,
+                            snapshot_cache=None):
     """将 XY-Cut 的 regions 输出转换为 rows。
 
     原则：region 内排序完全复用旧的行分组逻辑，从而保持
@@ -767,13 +887,14 @@ def _xy_cut_regions_to_rows(regions, row_threshold_points, slide_size=None):
     rows = []
     for region_shapes in regions:
         region_rows = _group_shapes_by_visual_rows_simple(
-            region_shapes, row_threshold_points
+            region_shapes, row_threshold_points, snapshot_cache=snapshot_cache
         )
         rows.extend(region_rows)
     return rows
 
 
-def _group_shapes_by_visual_rows_simple(shapes, row_threshold_points="auto"):
+def _group_shapes_by_visual_rows_simple(shapes, row_threshold_points="auto",
+                                        snapshot_cache=None):
     """按视觉位置对shape分行并在行内排序（返回二维数组）- 简单版本，不含 XY-Cut。
 
     - 行判定：按锚点y从上到下；y差小于阈值视为同一行
@@ -784,52 +905,64 @@ def _group_shapes_by_visual_rows_simple(shapes, row_threshold_points="auto"):
         row_threshold_points: 同行判定阈值
             - "auto": 自适应模式，基于文本高度动态计算（推荐）
             - 数字: 固定阈值（磅）
+        snapshot_cache: {id(shape): snapshot}，若为空则现场构建
 
     Returns:
         List[List[shape]]
     """
     shapes_list = list(shapes)
+    n = len(shapes_list)
+    if n == 0:
+        return []
+
+    if snapshot_cache is None:
+        snapshot_cache = _build_snapshot_cache(shapes_list)
 
     # 解析阈值参数
     if row_threshold_points == "auto":
-        threshold = _compute_adaptive_row_threshold(shapes_list)
+        threshold = _compute_adaptive_row_threshold(shapes_list, snapshot_cache=snapshot_cache)
     else:
         threshold = float(row_threshold_points)
 
-    items = []
-    for shape in shapes_list:
+    xs = np.empty(n, dtype=np.float64)
+    ys = np.empty(n, dtype=np.float64)
+    for i, shape in enumerate(shapes_list):
         try:
-            x, y = _shape_anchor_xy(shape)
-            items.append({"x": x, "y": y, "shape": shape})
+            x, y = _snapshot_anchor_xy(snapshot_cache[id(shape)])
         except Exception as e:
             _debug_exc("_group_shapes_by_visual_rows_simple: 读取锚点失败", e)
-            items.append({"x": float("inf"), "y": float("inf"), "shape": shape})
+            x = y = float("inf")
+        xs[i] = x
+        ys[i] = y
 
-    items.sort(key=lambda it: (it["y"], it["x"]))
+    # 按 (y, x) 排序后，相邻 y 差大于阈值的位置必然分行 —— 向量化一次算出粗分段
+    order = np.lexsort((xs, ys))
+    y_sorted = ys[order]
+    with np.errstate(invalid="ignore"):
+        breaks = np.nonzero(np.diff(y_sorted) > threshold)[0] + 1
 
-    rows = []
-    current = []
-    current_y = None
-
-    for it in items:
-        if current_y is None:
-            current = [it]
-            current_y = it["y"]
-            continue
+    def _emit_row(idx):
+        idx = idx[np.argsort(xs[idx], kind="stable")]
+        return [shapes_list[i] for i in idx]
 
-        if abs(it["y"] - current_y) <= threshold:
-            current.append(it)
-            # 动态更新本行中心y，避免"链式接近"导致误切行
-            current_y = (current_y * (len(current) - 1) + it["y"]) / float(len(current))
-        else:
-            current.sort(key=lambda x: x["x"])
-            rows.append([x["shape"] for x in current])
-            current = [it]
-            current_y = it["y"]
-
-    if current:
-        current.sort(key=lambda x: x["x"])
-        rows.append([x["shape"] for x in current])
+    rows = []
+    for seg in np.split(order, breaks):
+        # 段内保留旧的"运行均值"细分判定（动态更新本行中心y，避免"链式接近"导致误切行）
+        seg_y = ys[seg].tolist()
+        start = 0
+        current_y = seg_y[0]
+        count = 1
+        for k in range(1, len(seg)):
+            yk = seg_y[k]
+            if abs(yk - current_y) <= threshold:
+                count += 1
+                current_y = (current_y * (count - 1) + yk) / float(count)
+            else:
+                rows.append(_emit_row(seg[start:k]))
+                start = k
+                current_y = yk
+                count = 1
+        rows.append(_emit_row(seg[start:]))
 
     return rows
 
@@ -856,16 +989,21 @@ def group_shapes_by_visual_rows(shapes, row_threshold_points="auto",
     """
     shapes_list = list(shapes)
 
+    # 每个 shape 只做一次 COM 属性快照，后续排序/切割全部走快照
+    snapshot_cache = _build_snapshot_cache(shapes_list)
+
     # 排除指定的 shape（如已单独渲染的标题）
     if exclude_shape_ids:
-        shapes_list = [s for s in shapes_list if _safe_shape_id(s) not in exclude_shape_ids]
+        shapes_list = [s for s in shapes_list
+                       if snapshot_cache[id(s)]["id"] not in exclude_shape_ids]
 
     # 不启用 XY-Cut 或 shape 数量太少，直接使用简单版本
     if not enable_xy_cut or len(shapes_list) <= 2:
-        return _group_shapes_by_visual_rows_simple(shapes_list, row_threshold_points)
+        return _group_shapes_by_visual_rows_simple(shapes_list, row_threshold_points,
+                                                   snapshot_cache=snapshot_cache)
 
     # 预计算 bbox_cache
-    bbox_cache = {id(s): _shape_bbox(s) for s in shapes_list}
+    bbox_cache = {id(s): _snapshot_bbox(snapshot_cache[id(s)]) for s in shapes_list}
 
     # 计算 region_bbox
     if slide_size is not None:
@@ -874,13 +1012,16 @@ def group_shapes_by_visual_rows(shapes, row_threshold_points="auto",
         region_bbox = _compute_region_bbox_from_cache(shapes_list, bbox_cache)
 
     if region_bbox is None:
-        return _group_shapes_by_visual_rows_simple(shapes_list, row_threshold_points)
+        return _group_shapes_by_visual_rows_simple(shapes_list, row_threshold_points,
+                                                   snapshot_cache=snapshot_cache)
 
     # 执行 XY-Cut 分区
-    regions = _xy_cut_partition(shapes_list, region_bbox, 0, bbox_cache, row_threshold_points)
+    regions = _xy_cut_partition(shapes_list, region_bbox, 0, bbox_cache, row_threshold_points,
+                                snapshot_cache=snapshot_cache)
 
     # 将 regions 转换为 rows
-    return _xy_cut_regions_to_rows(regions, row_threshold_points, slide_size=slide_size)
+    return _xy_cut_regions_to_rows(regions, row_threshold_points, slide_size=slide_size,
+                                   snapshot_cache=snapshot_cache)
 
 
 def is_list_block(shape):
@@ -945,7 +1086,7 @@ def extract_text_from_shape(shape, skip_first_para_text=None, image_ctx=None, im
 # ============================================================================
 
 def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth=0, max_depth=5,
-                         ui_enabled=True, image_ctx=None, cancel_event=None):
+                         ui_enabled=True, image_ctx=None, cancel_event=None, prog_id=None):
     """提取嵌入的PPT内容（支持多层嵌套，路径以引用块形式输出，如：`路径：S2/E1/S1`）。
 
     Args:
@@ -955,6 +1096,7 @@ def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth
         loc_parts: 当前位置路径分段，如 ["S2", "E1"]
         depth: 当前嵌套深度（0表示主PPT页内的嵌入PPT）
         max_depth: 最大递归深度（包含当前层），防止极端嵌套导致卡死
+        prog_id: （可选）调用方已读到的 OLEFormat.ProgID，传入则跳过重读
     """
     content = []
     embedded_ppt = None
@@ -962,7 +1104,8 @@ def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth
     allow_ui = bool(ui_enabled) and (int(depth) <= 0)  # 仅顶层嵌入允许走UI激活/DoVerb，避免多层状态污染
     loc_parts = list(loc_parts) if loc_parts else []
     try:
-        prog_id = shape.OLEFormat.ProgID
+        if prog_id is None:
+            prog_id = shape.OLEFormat.ProgID
         if 'PowerPoint' not in prog_id:
             prefix = _format_loc(loc_parts)
             if prefix:
@@ -1057,11 +1200,11 @@ def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth
             # 第一轮：普通内容（跳过嵌入PPT对象，稍后递归处理）
             row_lines, row_embedded_shapes = _process_shape_rows_core(
                 shape_rows,
-                slide_loc=_format_loc(slide_loc),
+                slide_loc=slide_loc_str,
                 row_renderer_fn=_render_texts_from_shape_row,
                 skip_map=skip_map,
                 image_ctx=image_ctx,
-                embedded_object_line_fn=lambda pid: _md_comment(f"{_format_loc(slide_loc)} embedded-object: {pid}"),
+                embedded_object_line_fn=lambda pid: _md_comment(f"{slide_loc_str} embedded-object: {pid}"),
                 debug_exc_fn=_debug_exc,
                 debug_context_prefix="extract_embedded_ppt",
             )
@@ -1073,12 +1216,13 @@ def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth
 
             # 第二轮：递归处理嵌入PPT
             if int(depth) + 1 < int(max_depth):
-                for s in embedded_shapes:
+                for s, child_prog_id in embedded_shapes:
                     embedded_in_slide += 1
                     child_loc = slide_loc + [f"E{embedded_in_slide}"]
+                    child_loc_str = _format_loc(child_loc)
                     if slide_has_content:
                         content.append(_md_hr())
-                    content.append(_md_embedded_ppt_marker(f"嵌入PPT #{embedded_in_slide}", _format_loc(child_loc)))
+                    content.append(_md_embedded_ppt_marker(f"嵌入PPT #{embedded_in_slide}", child_loc_str))
                     slide_has_content = True
                     try:
                         content.extend(extract_embedded_ppt(
@@ -1091,17 +1235,18 @@ def extract_embedded_ppt(shape, ppt_app, activate_fn=None, loc_parts=None, depth
                             ui_enabled=ui_enabled,
                             image_ctx=image_ctx,
                             cancel_event=cancel_event,
+                            prog_id=child_prog_id,
                         ))
                     except ConversionCancelled:
                         raise
                     except Exception as e:
                         _debug_exc("extract_embedded_ppt: 递归提取嵌入PPT失败", e)
                         content.append(_md_comment(
-                            f"{_format_loc(child_loc)} embedded-ppt-fail: {_format_exc(e, limit=80)}"
+                            f"{child_loc_str} embedded-ppt-fail: {_format_exc(e, limit=80)}"
                         ) + "\n")
             elif embedded_shapes:
                 content.append(_md_comment(
-                    f"{_format_loc(slide_loc)} max-depth-reached: {max_depth}, skip deeper embedded"
+                    f"{slide_loc_str} max-depth-reached: {max_depth}, skip deeper embedded"
                 ) + "\n")
 
             # 在嵌入幻灯片之间添加分隔符（最后一个除外）
@@ -1152,6 +1297,8 @@ def extract_ppt_content(config=None, log_callback=None, progress_callback=None,
     finally:
         _log_cb = None
         _progress_cb = None
+        _reset_shape_index_cache()
+        _reset_slide_title_cache()
 
 
 def _extract_ppt_content_inner(config, cancel_event,
@@ -1204,16 +1351,24 @@ def _extract_ppt_content_inner(config, cancel_event,
         _log("INFO", f"图片: 启用 (目录: {image_ctx.get('dir')})")
     else:
         _log("INFO", "图片: 禁用 (输出占位标注)")
-    md = []
     presentation = None
     ppt_app = None
     com_initialized = False
+    out_f = None
 
     try:
         pythoncom.CoInitialize()
         com_initialized = True
 
         ppt_app = win32com.client.DispatchEx("PowerPoint.Application")
+        try:
+            # 早绑定：用 makepy 包装 DispatchEx 实例（保持独立进程实例不变），
+            # 后续所有属性访问走 vtable 调用，省去晚绑定每次的名字解析往返。
+            # gencache 生成失败（如无写权限）时静默回退晚绑定，行为不变。
+            from win32com.client import gencache
+            ppt_app = gencache.EnsureDispatch(ppt_app)
+        except Exception as e:
+            _debug_exc("extract_ppt_content: makepy早绑定失败，回退晚绑定", e)
         runtime_info = get_runtime_powerpoint_com_info(ppt_app)
         if runtime_info.get("vendor") == "wps":
             _log("ERROR", build_powerpoint_com_repair_message(
@@ -1230,30 +1385,46 @@ def _extract_ppt_content_inner(config, cancel_event,
                 _debug_exc("extract_ppt_content: 设置Visible=False失败，回退Visible=True", e)
                 _try_call(lambda: setattr(ppt_app, "Visible", True), "extract_ppt_content: 回退Visible=True失败")
         _try_call(lambda: setattr(ppt_app, "DisplayAlerts", 0), "extract_ppt_content: 设置DisplayAlerts失败")
+        # 3 = msoAutomationSecurityForceDisable：跳过宏/外链安全弹窗，避免 Open 被对话框卡住
+        _try_call(lambda: setattr(ppt_app, "AutomationSecurity", 3), "extract_ppt_content: 设置AutomationSecurity失败")
 
         if cancel_event and cancel_event.is_set():
             raise ConversionCancelled()
 
         _log("INFO", "正在处理...")
+
+        def _open_presentation(with_window):
+            # ReadOnly 打开可跳过写锁创建与自动保存追踪（大文件时启动更快）；
+            # 个别环境不认完整签名时回退旧调用。
+            try:
+                return ppt_app.Presentations.Open(ppt_path, ReadOnly=True, Untitled=False,
+                                                  WithWindow=with_window)
+            except TypeError as e:
+                _debug_exc("extract_ppt_content: ReadOnly签名打开失败，回退默认签名", e)
+                return ppt_app.Presentations.Open(ppt_path, WithWindow=with_window)
+
         if ui:
-            presentation = ppt_app.Presentations.Open(ppt_path, WithWindow=True)
+            presentation = _open_presentation(True)
         else:
             try:
-                presentation = ppt_app.Presentations.Open(ppt_path, WithWindow=False)
+                presentation = _open_presentation(False)
             except Exception as e:
                 _debug_exc("extract_ppt_content: WithWindow=False打开失败，回退WithWindow=True", e)
-                presentation = ppt_app.Presentations.Open(ppt_path, WithWindow=True)
+                presentation = _open_presentation(True)
         if not ui:
             _try_call(lambda: setattr(ppt_app, "WindowState", 2), "extract_ppt_content: 最小化Application窗口失败")
             _try_call(lambda: setattr(ppt_app.ActiveWindow, "WindowState", 2), "extract_ppt_content: 最小化ActiveWindow失败")
 
-        ppt_title = os.path.splitext(os.path.basename(ppt_path))[0]
-        md.append(f"# {ppt_title}\n\n")
-
         total = _wait_com(lambda: presentation.Slides.Count, COM_OPEN_TIMEOUT_SEC,
                           "extract_ppt_content: 等待PPT打开", cancel_event=cancel_event)
         embedded_count = 0
 
+        # PPT 确认可读后逐页落盘：不再在内存里攒整份文档（上千页带嵌入时可达数百 MiB）；
+        # 取消/中途出错时已完成的页保留在磁盘上。
+        out_f = open(output_path, 'w', encoding='utf-8', buffering=1 << 20)
+        ppt_title = os.path.splitext(os.path.basename(ppt_path))[0]
+        out_f.write(f"# {ppt_title}\n\n")
+
         slide_size = None
         try:
             slide_width = float(presentation.PageSetup.SlideWidth)
@@ -1266,13 +1437,16 @@ def _extract_ppt_content_inner(config, cancel_event,
             if cancel_event and cancel_event.is_set():
                 raise ConversionCancelled()
 
+            # 本页片段先攒在列表里，页尾一次 writelines
+            slide_md = []
+
             try:
                 slide = presentation.Slides(idx)
             except Exception as e:
                 _log("WARNING", f"[{idx}/{total}] 跳过(错误)")
-                md.append(_md_slide_heading_with_ref(TITLE_HEADING_LEVEL, f"幻灯片 {idx}", "幻灯片", idx, f"S{idx}"))
-                md.append(_md_comment("slide-access-error"))
-                md.append("\n---\n\n")
+                out_f.write(_md_slide_heading_with_ref(TITLE_HEADING_LEVEL, f"幻灯片 {idx}", "幻灯片", idx, f"S{idx}"))
+                out_f.write(_md_comment("slide-access-error"))
+                out_f.write("\n---\n\n")
                 continue
 
             title_ctx = _build_title_render_context_core(
@@ -1287,13 +1461,13 @@ def _extract_ppt_content_inner(config, cancel_event,
             if _progress_cb:
                 _progress_cb(idx, total, title_text)
 
-            md.append(_md_slide_heading_with_ref(TITLE_HEADING_LEVEL, title_text, "幻灯片", idx, f"S{idx}"))
+            slide_md.append(_md_slide_heading_with_ref(TITLE_HEADING_LEVEL, title_text, "幻灯片", idx, f"S{idx}"))
             slide_has_content = False
             skip_map = title_ctx["skip_map"]
             exclude_ids = title_ctx["exclude_ids"]
 
             for text in title_ctx["extra_lines"]:
-                md.append(f"{text}\n")
+                slide_md.append(f"{text}\n")
                 if str(text).strip():
                     slide_has_content = True
 
@@ -1309,7 +1483,7 @@ def _extract_ppt_content_inner(config, cancel_event,
                     exclude_shape_ids=exclude_ids,
                 )
             except Exception as e:
-                md.append(_md_comment(f"slide-read-error: {str(e)[:50]}"))
+                slide_md.append(_md_comment(f"slide-read-error: {str(e)[:50]}"))
                 shape_rows = []
 
             row_lines, row_embedded_shapes = _process_shape_rows_core(
@@ -1324,16 +1498,16 @@ def _extract_ppt_content_inner(config, cancel_event,
             )
             embedded_shapes.extend(row_embedded_shapes)
             for text in row_lines:
-                md.append(f"{text}\n")
+                slide_md.append(f"{text}\n")
                 if str(text).strip():
                     slide_has_content = True
 
-            for shape in embedded_shapes:
+            for shape, shape_prog_id in embedded_shapes:
                 embedded_in_slide += 1
                 embedded_count += 1
                 if slide_has_content:
-                    md.append(_md_hr())
-                md.append(_md_embedded_ppt_marker(f"嵌入PPT #{embedded_in_slide}", f"S{idx}/E{embedded_in_slide}"))
+                    slide_md.append(_md_hr())
+                slide_md.append(_md_embedded_ppt_marker(f"嵌入PPT #{embedded_in_slide}", f"S{idx}/E{embedded_in_slide}"))
                 slide_has_content = True
                 try:
                     def _activate():
@@ -1352,7 +1526,7 @@ def _extract_ppt_content_inner(config, cancel_event,
                             cancel_event=cancel_event,
                         )
 
-                    md.extend(extract_embedded_ppt(
+                    slide_md.extend(extract_embedded_ppt(
                         shape,
                         ppt_app,
                         activate_fn=activate_fn,
@@ -1362,22 +1536,21 @@ def _extract_ppt_content_inner(config, cancel_event,
                         ui_enabled=ui,
                         image_ctx=image_ctx,
                         cancel_event=cancel_event,
+                        prog_id=shape_prog_id,
                     ))
                     slide_has_content = True
                 except ConversionCancelled:
                     raise
                 except Exception as e:
                     _debug_exc("extract_ppt_content: 提取嵌入PPT失败", e)
-                    md.append(_md_comment(f"embedded-ppt-fail: {_format_exc(e, limit=80)}") + "\n")
+                    slide_md.append(_md_comment(f"embedded-ppt-fail: {_format_exc(e, limit=80)}") + "\n")
 
-            md.append("\n---\n\n")
+            slide_md.append("\n---\n\n")
+            out_f.writelines(slide_md)
 
             if embedded_in_slide:
                 _log("INFO", f"  +{embedded_in_slide}个嵌入")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(''.join(md))
-
         _log("SUCCESS", f"完成: {total}张幻灯片, {embedded_count}个嵌入PPT")
         _log("INFO", f"保存: {output_path}")
 
@@ -1393,6 +1566,11 @@ def _extract_ppt_content_inner(config, cancel_event,
         return False
 
     finally:
+        if out_f is not None:
+            try:
+                out_f.close()
+            except Exception as e:
+                _debug_exc("extract_ppt_content: 关闭输出文件失败", e)
         if presentation is not None:
             try:
                 presentation.Close()
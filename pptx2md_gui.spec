@@ -253,6 +253,10 @@ a = Analysis(
     hooksconfig={},
     runtime_hooks=[],
     excludes=[
+        # === Unused stdlib (注意：tkinter 是 GUI 必需，不能排除) ===
+        "unittest", "test", "pydoc", "pydoc_data", "doctest",
+        "distutils", "lib2to3", "turtle", "idlelib",
+        "xml.dom.pulldom", "http.server", "smtplib", "ftplib", "telnetlib",
         # === Dev / test only ===
         "wand", "pytest", "_pytest", "yapf", "isort", "pycln",
         "sphinx",
@@ -295,6 +299,9 @@ a = Analysis(
     ],
     noarchive=False,
     cipher=block_cipher,
+    # 字节码按 -OO 预编译（Analysis(optimize=) 需 PyInstaller ≥6.6，与版本
+    # 约束一致）：PYZ 更小，启动时 unmarshal 更快
+    optimize=2,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
@@ -332,6 +339,9 @@ else:
         [],
         exclude_binaries=True,
         name=APP_NAME,
+        # 显式固定 PyInstaller ≥6 的 onedir 布局（EXE + _internal/ 边车目录），
+        # validate_gui_runtime 也按该布局校验
+        contents_directory="_internal",
         version=_version_info,
         debug=False,
         bootloader_ignore_signals=False,
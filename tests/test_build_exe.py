@@ -2,17 +2,26 @@
 
 from types import SimpleNamespace
 
+import pytest
+
 import build_exe
 
 
+def _fake_popen(calls, returncode):
+    """构造记录调用参数的假 Popen，stdout 为空流。"""
+
+    def fake_popen(cmd, cwd=None, env=None, **kwargs):
+        if calls is not None:
+            calls.append({"cmd": cmd, "cwd": cwd, "env": env})
+        return SimpleNamespace(stdout=iter(()), terminate=lambda: None, wait=lambda: returncode)
+
+    return fake_popen
+
+
 def test_build_onefile_sets_env_and_reports_exe(monkeypatch, capsys):
     calls = []
 
-    def fake_run(cmd, cwd=None, env=None):
-        calls.append({"cmd": cmd, "cwd": cwd, "env": env})
-        return SimpleNamespace(returncode=0)
-
-    monkeypatch.setattr(build_exe.subprocess, "run", fake_run)
+    monkeypatch.setattr(build_exe.subprocess, "Popen", _fake_popen(calls, 0))
     monkeypatch.setenv(build_exe.ONEFILE_ENV_VAR, "0")
 
     ok = build_exe.build(use_onefile=True)
@@ -28,11 +37,7 @@ def test_build_onefile_sets_env_and_reports_exe(monkeypatch, capsys):
 def test_build_onedir_forces_non_onefile_env(monkeypatch, capsys):
     calls = []
 
-    def fake_run(cmd, cwd=None, env=None):
-        calls.append({"cmd": cmd, "cwd": cwd, "env": env})
-        return SimpleNamespace(returncode=0)
-
-    monkeypatch.setattr(build_exe.subprocess, "run", fake_run)
+    monkeypatch.setattr(build_exe.subprocess, "Popen", _fake_popen(calls, 0))
     monkeypatch.setenv(build_exe.ONEFILE_ENV_VAR, "1")
 
     ok = build_exe.build(use_onefile=False)
@@ -45,10 +50,7 @@ def test_build_onedir_forces_non_onefile_env(monkeypatch, capsys):
 
 
 def test_build_failure_returns_false(monkeypatch, capsys):
-    def fake_run(cmd, cwd=None, env=None):
-        return SimpleNamespace(returncode=2)
-
-    monkeypatch.setattr(build_exe.subprocess, "run", fake_run)
+    monkeypatch.setattr(build_exe.subprocess, "Popen", _fake_popen(None, 2))
 
     ok = build_exe.build(use_onefile=True)
     out = capsys.readouterr().out
@@ -56,3 +58,20 @@ def test_build_failure_returns_false(monkeypatch, capsys):
     assert ok is False
     assert "构建失败" in out
 
+
+def test_build_args_pass_pyinstaller_cli_validation():
+    """不打桩，直接用 PyInstaller 自己的解析器校验构建参数。
+
+    上面的测试用 _fake_popen 在参数校验之前就拦截了调用，发现不了
+    makespec-only 选项（如 --python-option、--contents-directory）混进
+    spec 构建命令导致 PyInstaller 解析阶段报错退出的问题。
+    """
+    pyi_main = pytest.importorskip("PyInstaller.__main__")
+
+    parser = pyi_main.generate_parser()
+    for force_clean in (False, True):
+        args = build_exe._pyinstaller_args("build_cache", force_clean=force_clean)
+        # 解析失败或含 makespec-only 选项时均抛 SystemExit
+        parsed = parser.parse_args(args)
+        parser._forbid_options(parsed, group="makespec", errmsg="makespec options not valid when a .spec file is given")
+
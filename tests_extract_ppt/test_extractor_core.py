@@ -64,7 +64,7 @@ def test_split_row_shapes_for_embedding():
     )
 
     assert normals == [normal]
-    assert embedded_ppts == [embedded_ppt]
+    assert embedded_ppts == [(embedded_ppt, "PowerPoint.Show.12")]
     assert embedded_objects == ["Excel.Sheet.12"]
 
 
@@ -297,7 +297,7 @@ def test_process_shape_rows_core():
     )
 
     assert lines == ["embedded-object: Excel.Sheet.12", "正文行"]
-    assert embedded_shapes == [embedded_ppt]
+    assert embedded_shapes == [(embedded_ppt, "PowerPoint.Show.12")]
     assert calls == [
         {"count": 1, "skip_map": {1: "标题"}, "image_ctx": {"enabled": True}, "loc_prefix": "S2/R1"},
     ]